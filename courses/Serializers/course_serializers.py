@@ -1,14 +1,93 @@
-from pydantic_core import ValidationError
+from decimal import Decimal
+from django.db.models import Avg, Count
+from django.utils.functional import cached_property
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
 from ..models.course_models import Course, Education, Subject
+from django.utils.text import format_lazy
 from django.utils.translation import gettext_lazy as _
 from ..validators import (
     MAX_COURSE_PRICE,
     MIN_COURSE_PRICE,
-    validate_image_size,
-    validate_image_dimensions,
+    validate_course_image,
 )
 
+COURSE_IMG_EXTENSIONS = frozenset({"jpg", "jpeg", "png"})
+
+# Validation messages (lazy: translated when rendered, built once at import)
+STUDENT_UPDATE_ERROR = _("Students are not allowed to update courses.")
+PUBLISH_INACTIVE_ERROR = _("Cannot publish a course that is not active.")
+PRICE_RANGE_ERROR = format_lazy(
+    _("Price must be between {min_price} and {max_price} EGP."),
+    min_price=MIN_COURSE_PRICE,
+    max_price=MAX_COURSE_PRICE,
+)
+TITLE_NUMERIC_ERROR = _("Title cannot be purely numeric.")
+IMG_EXTENSION_ERROR = _("Unsupported file extension. Allowed: .jpg, .jpeg, .png")
+UNVERIFIED_TEACHER_ERROR = _("Only verified teachers can create courses.")
+INACTIVE_EDUCATION_ERROR = _("Cannot create course in inactive education system.")
+
+
+class FastReadSerializer(serializers.Serializer):
+    """
+    Base class for read-only list serializers.
+
+    The readable fields are bound to their ``get_attribute``/``to_representation``
+    methods once per serializer instance; with ``many=True`` the child instance
+    is shared by every row, so the per-row loop only touches plain tuples.
+    """
+
+    @cached_property
+    def _bound_fields(self):
+        return tuple(
+            (field.field_name, field.get_attribute, field.to_representation)
+            for field in self._readable_fields
+        )
+
+    def to_representation(self, instance):
+        ret = {}
+        for field_name, get_attribute, to_representation in self._bound_fields:
+            try:
+                attribute = get_attribute(instance)
+            except SkipField:
+                continue
+
+            check_for_none = (
+                attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            )
+            if check_for_none is None:
+                ret[field_name] = None
+            else:
+                ret[field_name] = to_representation(attribute)
+        return ret
+
+
+class StoredDecimalField(serializers.DecimalField):
+    """
+    Read-only DecimalField for values read from a DecimalField column.
+
+    The database already returns them at ``decimal_places``, so those are
+    formatted directly instead of being re-quantized under a copied context.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+        self._stored_exponent = -self.decimal_places
+
+    def to_representation(self, value):
+        if (
+            isinstance(value, Decimal)
+            and value.as_tuple().exponent == self._stored_exponent
+            and getattr(self, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            and not self.localize
+            and not self.normalize_output
+        ):
+            return f"{value:f}"
+        return super().to_representation(value)
+
 
 class EducationDetailSerializer(serializers.ModelSerializer):
     class Meta:
@@ -16,17 +95,14 @@ class EducationDetailSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class EducationListSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Education
-        fields = [
-            "id",
-            "title",
-            "description",
-            "price",
-            "education_img",
-            "is_published",
-        ]
+class EducationListSerializer(FastReadSerializer):
+    """Read-only education system summary."""
+
+    id = serializers.IntegerField(read_only=True)
+    country = serializers.CharField(read_only=True)
+    country_code = serializers.CharField(read_only=True)
+    currency = serializers.CharField(read_only=True)
+    flag = serializers.ImageField(read_only=True)
 
 
 class SubjectDetailSerializer(serializers.ModelSerializer):
@@ -35,13 +111,16 @@ class SubjectDetailSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class SubjectListSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Subject
-        fields = ["id", "name", "description"]
+class SubjectListSerializer(FastReadSerializer):
+    """Read-only subject summary; explicit fields skip model introspection."""
+
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    description = serializers.CharField(read_only=True)
 
 
 class CourseDetailSerializer(serializers.ModelSerializer):
+    price = StoredDecimalField(max_digits=8, decimal_places=2)
     teacher_info = serializers.SerializerMethodField()
     education_name = serializers.ReadOnlyField(source="education.country")
     subject_name = serializers.ReadOnlyField(source="subject.name")
@@ -64,27 +143,52 @@ class CourseDetailSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """
+        Attach the relations and aggregates read by this serializer to ``queryset``.
+
+        ``enrollment_count`` reads the denormalized column, so only reviews
+        are joined here.
+        """
+        return queryset.select_related(
+            "teacher__user", "education", "subject"
+        ).annotate(
+            _review_count=Count("course_reviews"),
+            _average_rating=Avg("course_reviews__rating"),
+        )
+
     def get_teacher_info(self, obj):
-        if obj.teacher:
+        teacher = obj.teacher
+        if teacher:
             return {
-                "name": str(obj.teacher),
-                "experience_years": obj.teacher.experience_years,
+                "name": str(teacher),
+                "experience_years": teacher.experience_years,
             }
         return None
 
 
-class CourseListSerializer(serializers.ModelSerializer):
+class CourseListSerializer(FastReadSerializer):
+    """Read-only course summary; explicit fields skip model introspection."""
+
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    price = StoredDecimalField(max_digits=8, decimal_places=2)
+    subject = serializers.PrimaryKeyRelatedField(read_only=True)
     teacher_name = serializers.StringRelatedField(read_only=True, source="teacher")
 
-    class Meta:
-        model = Course
-        fields = [
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Load only the columns rendered by this serializer."""
+        return queryset.select_related("teacher__user").only(
             "id",
             "title",
             "price",
-            "subject",
-            "teacher_name",
-        ]
+            "subject_id",
+            "teacher__user__username",
+            "teacher__user__first_name",
+            "teacher__user__last_name",
+        )
 
 
 class CourseCreateUpdateSerializer(serializers.ModelSerializer):
@@ -108,71 +212,65 @@ class CourseCreateUpdateSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         user = request.user if request else None
 
-        if user.is_staff or user.is_superuser:
+        if user.is_admin:
             return attrs
 
-        if self.instance and (
-            (not (user.is_staff or user.is_superuser))
-            or getattr(user, "user_type", None) == "student"
-        ):
-            raise serializers.ValidationError(
-                _("Students are not allowed to update courses.")
-            )
+        instance = self.instance
+        if instance is None:
+            instance_is_active, instance_is_published = True, False
+        elif user.user_type == "student":
+            raise serializers.ValidationError(STUDENT_UPDATE_ERROR)
+        else:
+            instance_is_active = instance.is_active
+            instance_is_published = instance.is_published
 
-        is_active = attrs.get(
-            "is_active", self.instance.is_active if self.instance else True
-        )
-        is_published = attrs.get(
-            "is_published", self.instance.is_published if self.instance else False
-        )
+        is_active = attrs.get("is_active", instance_is_active)
+        is_published = attrs.get("is_published", instance_is_published)
 
         if not is_active and is_published:
-            raise serializers.ValidationError(
-                {"is_published": _("Cannot publish a course that is not active.")}
-            )
+            raise serializers.ValidationError({"is_published": PUBLISH_INACTIVE_ERROR})
         return attrs
 
     def validate_price(self, value):
         if value < MIN_COURSE_PRICE or value > MAX_COURSE_PRICE:
-            raise serializers.ValidationError(
-                _("Price must be between {min_price} and {max_price} EGP.").format(
-                    min_price=MIN_COURSE_PRICE, max_price=MAX_COURSE_PRICE
-                )
-            )
+            raise serializers.ValidationError(PRICE_RANGE_ERROR)
         return value
 
     def validate_title(self, value):
         if value.isdigit():
-            raise serializers.ValidationError(_("Title cannot be purely numeric."))
+            raise serializers.ValidationError(TITLE_NUMERIC_ERROR)
         return value
 
     def validate_course_img(self, value):
         if value:
-            validate_image_size(value)
-            validate_image_dimensions(value)
+            # Cheap extension check first, before the image is opened
+            ext = value.name.rpartition(".")[2]
+            if ext.lower() not in COURSE_IMG_EXTENSIONS:
+                raise serializers.ValidationError(IMG_EXTENSION_ERROR)
 
-            if not value.name.lower().endswith((".jpg", ".jpeg", ".png")):
-                raise serializers.ValidationError(
-                    _("Unsupported file extension. Allowed: .jpg, .jpeg, .png")
-                )
+            validate_course_image(value)
         return value
 
     def validate_teacher(self, value):
         # Ensure teacher is verified
         if not value.is_verified:
-            raise ValidationError(
-                {"teacher": _("Only verified teachers can create courses.")}
-            )
+            raise serializers.ValidationError(UNVERIFIED_TEACHER_ERROR)
         return value
 
     def validate_education(self, value):
         # Ensure education system is active
         if not value.is_active:
-            raise ValidationError(
-                {"education": _("Cannot create course in inactive education system.")}
-            )
+            raise serializers.ValidationError(INACTIVE_EDUCATION_ERROR)
         return value
 
     def create(self, validated_data):
         validated_data["teacher"] = self.context["request"].user.teacher_profile
-        return super().create(validated_data)
+        course = Course(**validated_data)
+        course.save(run_validation=True)
+        return course
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(run_validation=True)
+        return instance
@@ -1,7 +1,21 @@
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat, Trim
 from rest_framework import serializers
 from ..models import Enrollment, Review
 from django.utils.translation import gettext_lazy as _
 
+# Validation messages (lazy: translated when rendered, built once at import)
+NOT_STUDENT_ENROLL_ERROR = _("User must be a student to enroll.")
+COURSE_UNAVAILABLE_ERROR = _("This course is not available for enrollment.")
+ALREADY_ENROLLED_ERROR = _("You are already enrolled in this course.")
+NOT_STUDENT_REVIEW_ERROR = _("User must be a student to review.")
+REVIEW_NOT_ENROLLED_ERROR = _(
+    "You must have an active or completed enrollment to review this course."
+)
+ALREADY_REVIEWED_ERROR = _("You have already reviewed this course.")
+REVIEW_UNAVAILABLE_ERROR = _("Cannot review an inactive or unpublished course.")
+
 
 class CourseEnrollmentDetailSerializer(serializers.ModelSerializer):
     course_info = serializers.SerializerMethodField()
@@ -19,15 +33,39 @@ class CourseEnrollmentDetailSerializer(serializers.ModelSerializer):
             "transaction_id",
         ]
 
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Attach the relations read by this serializer to ``queryset``."""
+        # Same result as User.get_full_name(), built by the database
+        teacher_name = Trim(
+            Concat(
+                "course__teacher__user__first_name",
+                Value(" "),
+                "course__teacher__user__last_name",
+                output_field=CharField(),
+            )
+        )
+        return queryset.select_related("course__subject").annotate(
+            _teacher_name=teacher_name
+        )
+
     def get_course_info(self, obj):
         course = obj.course
+        course_img = course.course_img
+        subject = course.subject
+        if not course.teacher_id:
+            # The NULL-safe Concat renders a missing teacher as ""
+            teacher_name = None
+        else:
+            # Instances that didn't come through prefetch_queryset
+            teacher_name = getattr(obj, "_teacher_name", None)
+            if teacher_name is None:
+                teacher_name = course.teacher.user.get_full_name()
         return {
             "name": course.title,
-            "teacher_name": (
-                course.teacher.user.get_full_name() if course.teacher else None
-            ),
-            "course_img": course.course_img.url if course.course_img else None,
-            "subject": course.subject.name if course.subject else None,
+            "teacher_name": teacher_name,
+            "course_img": course_img.url if course_img else None,
+            "subject": subject.name if subject else None,
         }
 
 
@@ -39,6 +77,19 @@ class CourseEnrollmentListSerializer(serializers.ModelSerializer):
         model = Enrollment
         fields = ["id", "student_name", "course_title", "status", "enrolled_at"]
 
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Load only the columns rendered by this serializer."""
+        return queryset.select_related("student__user", "course").only(
+            "id",
+            "status",
+            "enrolled_at",
+            "student__user__username",
+            "student__user__first_name",
+            "student__user__last_name",
+            "course__title",
+        )
+
 
 class CourseEnrollmentCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -56,32 +107,38 @@ class CourseEnrollmentCreateSerializer(serializers.ModelSerializer):
         user = self.context["request"].user
 
         if not hasattr(user, "student_profile"):
-            raise serializers.ValidationError(_("User must be a student to enroll."))
-
-        student = user.student_profile
-
-        if not self.instance:
-            existing = Enrollment.objects.filter(
-                student=student, course=course
-            ).exclude(
-                status__in=[Enrollment.STATUS_CANCELLED, Enrollment.STATUS_REFUNDED]
-            )
-
-            if existing.exists():
-                raise serializers.ValidationError(
-                    _("You are already enrolled in this course.")
-                )
+            raise serializers.ValidationError(NOT_STUDENT_ENROLL_ERROR)
 
+        # The course instance is already loaded, so no query is needed here.
+        # Duplicate enrollments are rejected by the DB constraint in create().
         if not course.is_active or not course.is_published:
-            raise serializers.ValidationError(
-                _("This course is not available for enrollment.")
-            )
+            raise serializers.ValidationError(COURSE_UNAVAILABLE_ERROR)
 
         return attrs
 
     def create(self, validated_data):
         validated_data["student"] = self.context["request"].user.student_profile
-        return super().create(validated_data)
+        enrollment = Enrollment(**validated_data)
+        try:
+            with transaction.atomic():
+                enrollment.save(skip_validation=True)
+        except IntegrityError:
+            raise serializers.ValidationError(ALREADY_ENROLLED_ERROR)
+        return enrollment
+
+    def to_representation(self, instance):
+        """
+        Render the saved enrollment directly from its attributes.
+
+        The values were validated and written by this serializer, so the
+        per-field coercion of a second serializer pass is skipped.
+        """
+        return {
+            "id": instance.id,
+            "course": instance.course_id,
+            "payment_method": instance.payment_method,
+            "coupon_code": instance.coupon_code,
+        }
 
 
 class CourseReviewSerializer(serializers.ModelSerializer):
@@ -98,6 +155,19 @@ class CourseReviewSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Load only the columns rendered by this serializer."""
+        return queryset.select_related("student__user", "course").only(
+            "id",
+            "rating",
+            "created_at",
+            "student__user__username",
+            "student__user__first_name",
+            "student__user__last_name",
+            "course__title",
+        )
+
 
 class CourseReviewCreateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -113,40 +183,60 @@ class CourseReviewCreateSerializer(serializers.ModelSerializer):
         course = attrs.get("course")
         user = self.context["request"].user
 
-        if user.is_staff or user.is_superuser:
+        if user.is_admin:
             return attrs
 
         if not hasattr(user, "student_profile"):
-            raise serializers.ValidationError(_("User must be a student to review."))
+            raise serializers.ValidationError(NOT_STUDENT_REVIEW_ERROR)
 
         student = user.student_profile
 
+        # Duplicate reviews are rejected by the DB constraint in create()
         has_enrollment = student.my_enrollments.filter(
             course=course,
-            status__in=[Enrollment.STATUS_ACTIVE, Enrollment.STATUS_COMPLETED],
+            status__in=Enrollment.ENROLLED_STATUSES,
         ).exists()
 
         if not has_enrollment:
-            raise serializers.ValidationError(
-                _(
-                    "You must have an active or completed enrollment to review this course."
-                )
-            )
-
-        if Review.objects.filter(student=student, course=course).exists():
-            raise serializers.ValidationError(
-                _("You have already reviewed this course.")
-            )
+            raise serializers.ValidationError(REVIEW_NOT_ENROLLED_ERROR)
 
         return attrs
 
     def validate_course(self, value):
         if not (value.is_active or value.is_published):
-            raise serializers.ValidationError(
-                _("Cannot review an inactive or unpublished course.")
-            )
+            raise serializers.ValidationError(REVIEW_UNAVAILABLE_ERROR)
         return value
 
     def create(self, validated_data):
         validated_data["student"] = self.context["request"].user.student_profile
-        return super().create(validated_data)
+        # Enrollment was checked in validate(); skip the model's repeat of it
+        review = Review(**validated_data)
+        try:
+            with transaction.atomic():
+                review.save(skip_validation=True)
+        except IntegrityError:
+            raise serializers.ValidationError(ALREADY_REVIEWED_ERROR)
+        return review
+
+    def update(self, instance, validated_data):
+        # Moving a review onto an already-reviewed course hits the constraint
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        try:
+            with transaction.atomic():
+                instance.save(skip_validation=True)
+        except IntegrityError:
+            raise serializers.ValidationError(ALREADY_REVIEWED_ERROR)
+        return instance
+
+    def to_representation(self, instance):
+        """
+        Render the saved review directly from its attributes.
+
+        Only ``rating`` goes through its field, to keep the decimal formatting.
+        """
+        return {
+            "id": instance.id,
+            "course": instance.course_id,
+            "rating": self.fields["rating"].to_representation(instance.rating),
+        }
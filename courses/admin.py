@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.contrib import admin
 from .models import Education, Course, Lesson, Chapter, Subject, Enrollment
 
-admin.site.register(Education)
-admin.site.register(Course)
-admin.site.register(Chapter)
-admin.site.register(Lesson)
-admin.site.register(Subject)
-admin.site.register(Enrollment)
+# API-only deployments skip building the default ModelAdmin classes
+if getattr(settings, "ENABLE_DJANGO_ADMIN", True):
+    admin.site.register(Education)
+    admin.site.register(Course)
+    admin.site.register(Chapter)
+    admin.site.register(Lesson)
+    admin.site.register(Subject)
+    admin.site.register(Enrollment)
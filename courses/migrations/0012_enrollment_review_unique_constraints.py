@@ -0,0 +1,62 @@
+# Generated by Django 6.0.2 on 2026-10-14 12:16
+
+import django.core.validators
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0011_alter_enrollment_price_paid_and_more"),
+        ("users", "0008_alter_student_parent_phone_alter_student_phone"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="review",
+            options={
+                "ordering": ["-created_at"],
+                "verbose_name": "Review",
+                "verbose_name_plural": "Reviews",
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name="enrollment",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="review",
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name="review",
+            name="rating",
+            field=models.DecimalField(
+                db_index=True,
+                decimal_places=1,
+                default=5,
+                max_digits=2,
+                validators=[
+                    django.core.validators.MinValueValidator(Decimal("1.0")),
+                    django.core.validators.MaxValueValidator(Decimal("5.0")),
+                ],
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="enrollment",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("status__in", ["cancelled", "refunded"]), _negated=True
+                ),
+                fields=("student", "course"),
+                name="uniq_enrollment_per_student_course",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="review",
+            constraint=models.UniqueConstraint(
+                fields=("student", "course"), name="uniq_review_per_student_course"
+            ),
+        ),
+    ]
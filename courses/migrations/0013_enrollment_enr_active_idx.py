@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-14 12:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0012_enrollment_review_unique_constraints"),
+        ("users", "0008_alter_student_parent_phone_alter_student_phone"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="enrollment",
+            index=models.Index(
+                condition=models.Q(("status__in", ["active", "completed"])),
+                fields=["student", "course", "status"],
+                name="enr_active_idx",
+            ),
+        ),
+    ]
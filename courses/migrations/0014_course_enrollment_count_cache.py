@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-14 12:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_enrollment_count(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Enrollment = apps.get_model("courses", "Enrollment")
+    enrolled = (
+        Enrollment.objects.filter(
+            course=OuterRef("pk"), status__in=["active", "completed"]
+        )
+        .order_by()
+        .values("course")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Course.objects.update(enrollment_count_cache=Coalesce(Subquery(enrolled), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0013_enrollment_enr_active_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="enrollment_count_cache",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=0,
+                editable=False,
+                help_text="Active and completed enrollments",
+            ),
+        ),
+        migrations.RunPython(backfill_enrollment_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.2 on 2026-10-14 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0014_course_enrollment_count_cache"),
+        ("users", "0008_alter_student_parent_phone_alter_student_phone"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="course",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="course",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_active", True)),
+                fields=("teacher", "title"),
+                name="u_course_active_title",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-14 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0015_course_active_title_constraint"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="enrollment",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending Payment"),
+                    ("active", "Active"),
+                    ("completed", "Completed"),
+                    ("cancelled", "Cancelled"),
+                    ("refunded", "Refunded"),
+                    ("expired", "Expired"),
+                ],
+                default="pending",
+                help_text="Current enrollment status",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 6.0.2 on 2026-10-14 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0016_alter_enrollment_status"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="lesson",
+            name="courses_les_is_prev_924950_idx",
+        ),
+        migrations.AlterField(
+            model_name="lesson",
+            name="is_preview",
+            field=models.BooleanField(
+                default=False,
+                help_text="Free preview lesson (accessible without enrollment)",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(
+                fields=["chapter", "is_preview", "order"],
+                name="lesson_chap_prev_ord_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:01
+
+import courses.validators
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0017_lesson_chapter_preview_order_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="course",
+            name="course_img",
+            field=models.ImageField(
+                blank=True,
+                help_text="Course thumbnail (max 2MB, min 200x200px)",
+                null=True,
+                upload_to=courses.validators.course_image_path,
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["jpg", "jpeg", "png", "webp"]
+                    ),
+                    courses.validators.validate_course_image,
+                ],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="education",
+            name="flag",
+            field=models.ImageField(
+                blank=True,
+                help_text="Country flag image (max 2MB)",
+                null=True,
+                upload_to=courses.validators.education_flag_path,
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        allowed_extensions=["jpg", "jpeg", "png", "webp"]
+                    ),
+                    courses.validators.validate_course_image,
+                ],
+            ),
+        ),
+    ]
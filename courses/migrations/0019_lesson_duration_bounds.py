@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0018_course_image_validators"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="lesson",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("duration_seconds__gte", 1), ("duration_seconds__lte", 14400)
+                ),
+                name="lesson_duration_bounds",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0019_lesson_duration_bounds"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="lesson",
+            name="lesson_chap_prev_ord_idx",
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(
+                condition=models.Q(("is_preview", True)),
+                fields=["chapter", "order"],
+                name="lesson_preview_partial_idx",
+            ),
+        ),
+    ]
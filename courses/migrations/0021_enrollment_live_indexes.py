@@ -0,0 +1,30 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0020_lesson_preview_partial_index"),
+        ("users", "0008_alter_student_parent_phone_alter_student_phone"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="enrollment",
+            index=models.Index(
+                condition=models.Q(("status__in", ["active", "completed"])),
+                fields=["student", "-enrolled_at"],
+                name="enr_student_live_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="enrollment",
+            index=models.Index(
+                condition=models.Q(("status__in", ["active", "completed"])),
+                fields=["course", "-enrolled_at"],
+                name="enr_course_live_idx",
+            ),
+        ),
+    ]
@@ -1,10 +1,11 @@
 from decimal import Decimal
 from django.db import models
-from django.db.models import Avg, Sum
+from django.db.models import Avg, Count, OuterRef, Subquery, Sum
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
+from django.utils.functional import cached_property
 from django.core.validators import (
     MinValueValidator,
     MaxValueValidator,
@@ -21,13 +22,17 @@ from ..validators import (
     MAX_IMAGE_SIZE_MB as MAX_IMAGE_SIZE_MB,
     course_image_path as course_image_path,
     education_flag_path as education_flag_path,
+    validate_course_image as validate_course_image,
     validate_image_dimensions as validate_image_dimensions,
     validate_image_size as validate_image_size,
 )
 from users.models import Teacher
+from users.utils import count_subquery
+from .lesson_models import Lesson
 
 User = settings.AUTH_USER_MODEL
 
+
 # =====================
 # Education MODEL
 # =====================
@@ -59,8 +64,7 @@ class Education(models.Model):
         blank=True,
         validators=[
             FileExtensionValidator(allowed_extensions=ALLOWED_IMAGE_EXTENSIONS),
-            validate_image_size,
-            validate_image_dimensions,
+            validate_course_image,
         ],
         help_text=_(f"Country flag image (max {MAX_IMAGE_SIZE_MB}MB)"),
     )
@@ -215,6 +219,12 @@ class Subject(models.Model):
 # =====================
 
 
+class CourseQuerySet(models.QuerySet):
+    def for_list(self):
+        """Leave out the description TextField, which lists never render."""
+        return self.defer("description")
+
+
 class Course(models.Model):
     """
     Main course model with complete business logic.
@@ -273,8 +283,7 @@ class Course(models.Model):
         blank=True,
         validators=[
             FileExtensionValidator(allowed_extensions=ALLOWED_IMAGE_EXTENSIONS),
-            validate_image_size,
-            validate_image_dimensions,
+            validate_course_image,
         ],
         help_text=_(
             f"Course thumbnail (max {MAX_IMAGE_SIZE_MB}MB, "
@@ -313,9 +322,19 @@ class Course(models.Model):
         null=True, blank=True, help_text=_("Timestamp when course was soft-deleted")
     )
 
+    # Denormalized counters (kept in sync by courses.signals)
+    enrollment_count_cache = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        help_text=_("Active and completed enrollments"),
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CourseQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Course")
         verbose_name_plural = _("Courses")
@@ -328,14 +347,29 @@ class Course(models.Model):
             models.Index(fields=["is_active", "is_published", "-created_at"]),
             models.Index(fields=["price"]),
         ]
-        unique_together = [["teacher", "title"]]
+        constraints = [
+            # Titles only need to be unique among a teacher's live courses;
+            # the partial index leaves inactive courses out.
+            models.UniqueConstraint(
+                fields=["teacher", "title"],
+                condition=models.Q(is_active=True),
+                name="u_course_active_title",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         """
-        Override save to handle slug generation and validation.
+        Override save to handle slug generation and optional validation.
+
+        Note: full_clean() only runs with run_validation=True. The API runs it
+        from CourseCreateUpdateSerializer; internal state changes (publish,
+        activate, soft_delete) save trusted data and skip it. Unlike Teacher,
+        Student and Lesson, which validate unless skip_validation=True, Course
+        validation is opt-in; skip_validation is still accepted (and is a
+        no-op) so existing callers keep working.
         """
         # Auto-generate slug from title
         if not self.slug:
@@ -343,66 +377,119 @@ class Course(models.Model):
             slug = base_slug
             counter = 1
 
-            # Ensure unique slug
-            while Course.objects.filter(slug=slug).exclude(pk=self.pk).exists():
+            # Ensure unique slug (fetch all candidates in one query)
+            taken = set(
+                Course.objects.filter(slug__startswith=base_slug)
+                .exclude(pk=self.pk)
+                .values_list("slug", flat=True)
+            )
+            while slug in taken:
                 slug = f"{base_slug}-{counter}"
                 counter += 1
 
             self.slug = slug
 
-        # Run validation unless explicitly skipped
-        if not kwargs.pop("skip_validation", False):
+        # Run validation only when explicitly requested
+        run_validation = kwargs.pop("run_validation", False)
+        kwargs.pop("skip_validation", None)
+        if run_validation:
             self.full_clean()
 
         super().save(*args, **kwargs)
 
     @property
     def enrollment_count(self):
-        """Total enrollements"""
-        return self.course_enrollments.filter(
-            status__in=["active", "completed"]
-        ).count()
+        """Total active and completed enrollments (denormalized column)"""
+        return self.enrollment_count_cache
+
+    @classmethod
+    def refresh_enrollment_count(cls, *course_ids):
+        """
+        Recount the given courses' enrollments into ``enrollment_count_cache``.
+
+        A single UPDATE with a COUNT subquery, so concurrent enrollment
+        writes can't leave the counter off by one.
+        """
+        enrollment_model = cls.course_enrollments.rel.related_model
+        enrolled = enrollment_model.objects.filter(
+            course=OuterRef("pk"), status__in=enrollment_model.ENROLLED_STATUSES
+        )
+        cls.objects.filter(pk__in=course_ids).update(
+            enrollment_count_cache=count_subquery(enrolled, "course")
+        )
 
     @property
     def total_revenue(self):
         """
         Total revenue from active enrollments.
         Note: Use annotations for better performance:
-        Course.objects.annotate(total_revenue=Sum('enrollments__price_paid'))
+        Course.objects.annotate(_total_revenue=Sum('course_enrollments__price_paid'))
         """
+        if "_total_revenue" in self.__dict__:
+            return self._total_revenue or Decimal("0.00")
         result = self.course_enrollments.filter(status="active").aggregate(
             total=Sum("price_paid")
         )
         return result["total"] or Decimal("0.00")
 
-    @property
+    @cached_property
     def review_count(self):
-        """total_revenue"""
-        return self.course_reviews.count() if hasattr(self, "course_reviews") else 0
+        """Total reviews (annotation, prefetched rows, or a COUNT query)"""
+        if "_review_count" in self.__dict__:
+            return self._review_count
+        if "course_reviews" in getattr(self, "_prefetched_objects_cache", {}):
+            return len(self.course_reviews.all())
+        return self.course_reviews.count()
 
     @property
     def average_rating(self):
         """
         Average course rating.
 
+        Uses the ``_average_rating`` annotation when the queryset provides it.
+
         Returns:
             Decimal: Average rating or 0 if no reviews
         """
+        if "_average_rating" in self.__dict__:
+            return self._average_rating or Decimal("0.0")
         result = self.course_reviews.aggregate(avg=Avg("rating"))
         return result["avg"] or Decimal("0.0")
 
     @property
     def lesson_count(self):
-        """Total lessons (via chapters)"""
-        from .lesson_models import Lesson
-
-        return Lesson.objects.filter(chapter__course=self).count()
+        """Total lessons via chapters (uses ``_lesson_count`` annotation if present)"""
+        if "_lesson_count" in self.__dict__:
+            return self._lesson_count
+        return Lesson.objects.filter(chapter__course_id=self.pk).count()
 
     @property
     def chapter_count(self):
-        """Total chapters"""
+        """Total chapters (uses ``_chapter_count`` annotation if present)"""
+        if "_chapter_count" in self.__dict__:
+            return self._chapter_count
         return self.chapters_of_course.count()
 
+    @classmethod
+    def with_counts(cls, queryset=None):
+        """
+        Annotate chapter and lesson counts for every course in one query.
+
+        The count properties read these annotations instead of querying per
+        instance. Each count is a correlated subquery, so no JOIN multiplies
+        the course rows and other annotations can be stacked on top.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        chapters = cls.chapters_of_course.rel.related_model.objects.filter(
+            course=OuterRef("pk")
+        )
+        lessons = Lesson.objects.filter(chapter__course=OuterRef("pk"))
+        return queryset.annotate(
+            _chapter_count=count_subquery(chapters, "course"),
+            _lesson_count=count_subquery(lessons, "chapter__course"),
+        )
+
     def publish(self, commit=True):
         """
         Publish course (make visible to students).
@@ -490,15 +577,52 @@ class Course(models.Model):
 
     def get_course_stats(self):
         """
-        Get comprehensive course statistics.
+        Get comprehensive course statistics in a single query.
+
+        Each figure is a scalar subquery filtered on this course's pk rather
+        than a join, so the enrollment, review and chapter rows can't multiply
+        into each other's sums and counts. The enrollment count comes from
+        its cached column.
+
         Returns:
             dict: Course statistics
         """
+
+        def scalar(queryset, aggregate):
+            return Subquery(
+                queryset.order_by()
+                .values("course")
+                .annotate(value=aggregate)
+                .values("value")
+            )
+
+        chapters = self.chapters_of_course.all()
+        stats = (
+            Course.objects.filter(pk=self.pk)
+            .annotate(
+                revenue=scalar(
+                    self.course_enrollments.filter(status="active"), Sum("price_paid")
+                ),
+                reviews=scalar(self.course_reviews.all(), Count("pk")),
+                average_rating=scalar(self.course_reviews.all(), Avg("rating")),
+                chapters=scalar(chapters, Count("pk")),
+                lessons=scalar(chapters, Count("lessons_of_chapter")),
+            )
+            .values(
+                "enrollment_count_cache",
+                "revenue",
+                "reviews",
+                "average_rating",
+                "chapters",
+                "lessons",
+            )
+            .get()
+        )
         return {
-            "enrollments": self.enrollment_count,
-            "revenue": self.total_revenue,
-            "reviews": self.review_count,
-            "average_rating": self.average_rating,
-            "chapters": self.chapter_count,
-            "lessons": self.lesson_count,
+            "enrollments": stats["enrollment_count_cache"],
+            "revenue": stats["revenue"] or Decimal("0.00"),
+            "reviews": stats["reviews"] or 0,
+            "average_rating": stats["average_rating"] or Decimal("0.0"),
+            "chapters": stats["chapters"] or 0,
+            "lessons": stats["lessons"] or 0,
         }
@@ -1,9 +1,9 @@
-from datetime import timezone
 from decimal import Decimal
 from typing import Optional
 from django.db import models
 from users.models import Student
 from django.forms import ValidationError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import (
     MinValueValidator,
@@ -11,11 +11,23 @@ from django.core.validators import (
 )
 from ..validators import MAX_COURSE_PRICE
 
+REVIEW_NOT_ENROLLED_ERROR = _("Student must be enrolled to review the course.")
+
+# Completion percentage bounds
+MIN_PROGRESS = Decimal("0.00")
+MAX_PROGRESS = Decimal("100.00")
+
 # =====================
 # Enrollment MODEL
 # =====================
 
 
+class EnrollmentQuerySet(models.QuerySet):
+    def for_list(self):
+        """Leave out the refund_reason TextField, which lists never render."""
+        return self.defer("refund_reason")
+
+
 class Enrollment(models.Model):
     """
     Enrollment model with complete payment tracking and state management.
@@ -44,6 +56,9 @@ class Enrollment(models.Model):
         (STATUS_REFUNDED, _("Refunded")),
         (STATUS_EXPIRED, _("Expired")),
     )
+    # Status groups used in filters and membership checks
+    ENROLLED_STATUSES = frozenset({STATUS_ACTIVE, STATUS_COMPLETED})
+    CLOSED_STATUSES = frozenset({STATUS_CANCELLED, STATUS_REFUNDED})
     # Payment method choices
     PAYMENT_CREDIT_CARD = "credit_card"
     PAYMENT_DEBIT_CARD = "debit_card"
@@ -74,11 +89,11 @@ class Enrollment(models.Model):
         help_text=_("Course enrolled in"),
     )
 
+    # No standalone index: Meta.indexes has composites led by status
     status = models.CharField(
         max_length=20,
         choices=STATUS_CHOICES,
         default=STATUS_PENDING,
-        db_index=True,
         help_text=_("Current enrollment status"),
     )
 
@@ -155,10 +170,10 @@ class Enrollment(models.Model):
     completion_percentage = models.DecimalField(
         max_digits=5,
         decimal_places=2,
-        default=Decimal("0.00"),
+        default=MIN_PROGRESS,
         validators=[
-            MinValueValidator(Decimal("0.00")),
-            MaxValueValidator(Decimal("100.00")),
+            MinValueValidator(MIN_PROGRESS),
+            MaxValueValidator(MAX_PROGRESS),
         ],
         help_text=_("Course completion percentage"),
     )
@@ -179,6 +194,8 @@ class Enrollment(models.Model):
 
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EnrollmentQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Enrollment")
         verbose_name_plural = _("Enrollments")
@@ -189,7 +206,14 @@ class Enrollment(models.Model):
                 fields=["transaction_id"],
                 condition=models.Q(transaction_id__isnull=False),
                 name="unique_transaction_id",
-            )
+            ),
+            # One live enrollment per student/course; cancelled or refunded
+            # enrollments do not block re-enrolling.
+            models.UniqueConstraint(
+                fields=["student", "course"],
+                condition=~models.Q(status__in=["cancelled", "refunded"]),
+                name="uniq_enrollment_per_student_course",
+            ),
         ]
 
         indexes = [
@@ -200,8 +224,25 @@ class Enrollment(models.Model):
             models.Index(fields=["student", "status"]),
             models.Index(fields=["course", "status"]),
             models.Index(fields=["transaction_id"]),
+            # Answers the "enrolled in this course?" check used by reviews
+            models.Index(
+                fields=["student", "course", "status"],
+                name="enr_active_idx",
+                condition=models.Q(status__in=["active", "completed"]),
+            ),
+            # CourseEnrollmentViewSet: live enrollments of one student, or of
+            # one teacher's courses, newest first (Meta.ordering)
+            models.Index(
+                fields=["student", "-enrolled_at"],
+                name="enr_student_live_idx",
+                condition=models.Q(status__in=["active", "completed"]),
+            ),
+            models.Index(
+                fields=["course", "-enrolled_at"],
+                name="enr_course_live_idx",
+                condition=models.Q(status__in=["active", "completed"]),
+            ),
         ]
-        unique_together = [["student", "course"]]
 
     def __str__(self):
         return f"{self.student.user.get_full_name()} - {self.course.title}"
@@ -218,25 +259,39 @@ class Enrollment(models.Model):
         """
         Override save to set default prices and run validation.
         """
-        # Auto-set original_price from course if not provided
-        if self.original_price is None and self.course_id:
-            self.original_price = self.course.price
+        update_fields = kwargs.get("update_fields")
+        sets_prices = update_fields is None or not {
+            "original_price",
+            "price_paid",
+        }.isdisjoint(update_fields)
+
+        # Auto-set original_price from course if not provided. Fetch only the
+        # price unless the course is already loaded on this instance.
+        if sets_prices and self.original_price is None and self.course_id:
+            if Enrollment.course.is_cached(self):
+                self.original_price = self.course.price
+            else:
+                course_model = Enrollment.course.field.related_model
+                self.original_price = (
+                    course_model.objects.filter(pk=self.course_id)
+                    .values_list("price", flat=True)
+                    .get()
+                )
 
         # Auto-calculate price_paid if not provided
-        if self.price_paid is None:
+        if sets_prices and self.price_paid is None:
             self.price_paid = self.original_price - self.discount_amount
 
         # Validate completion percentage
-        if self.completion_percentage == Decimal("100.00") and not self.completed_at:
+        if self.completion_percentage == MAX_PROGRESS and not self.completed_at:
             # Auto-set completed timestamp
             self.completed_at = timezone.now()
             self.status = self.STATUS_COMPLETED
-
-        if "update_fields" in kwargs and kwargs["update_fields"] is not None:
-            updated = set(kwargs["update_fields"])
-            updated.add("completed_at")
-            updated.add("status")
-            kwargs["update_fields"] = list(updated)
+            # Persist the auto-completion even on a partial save
+            if update_fields is not None:
+                kwargs["update_fields"] = list(
+                    {*update_fields, "completed_at", "status"}
+                )
 
         # Run validation unless explicitly skipped
         if not kwargs.pop("skip_validation", False):
@@ -244,6 +299,65 @@ class Enrollment(models.Model):
 
         super().save(*args, **kwargs)
 
+    @classmethod
+    def _validate_changes(cls, rows, changes):
+        """
+        Run the field validators and unique checks full_clean() would.
+
+        A queryset UPDATE skips both, so transitions call this first. ``rows``
+        are the enrollments about to be written; they don't count as other
+        holders of a unique value.
+
+        Raises:
+            ValidationError: If a value fails its field validators or is
+                already used by another enrollment
+        """
+        errors = {}
+        for name, value in changes.items():
+            field = cls._meta.get_field(name)
+            try:
+                field.run_validators(value)
+            except ValidationError as e:
+                errors[name] = e.error_list
+                continue
+            if not field.unique or value is None:
+                continue
+            # One value can't be shared by several rows either
+            taken = (
+                cls.objects.filter(**{name: value})
+                .exclude(pk__in=rows.values("pk"))
+                .exists()
+            )
+            if taken or rows[:2].count() > 1:
+                errors[name] = [
+                    ValidationError(
+                        _("This %(field)s is already in use."),
+                        code="unique",
+                        params={"field": field.verbose_name},
+                    )
+                ]
+        if errors:
+            raise ValidationError(errors)
+
+    def _transition(self, queryset, **changes):
+        """
+        Apply ``changes`` with a single UPDATE guarded by ``queryset``.
+
+        ``queryset`` carries the status predicate, so a transition that lost a
+        race (or was already applied) matches no row and returns False. The
+        UPDATE bypasses post_save, so the course counter is refreshed here.
+        """
+        self._validate_changes(Enrollment.objects.filter(pk=self.pk), changes)
+        changes["updated_at"] = timezone.now()
+        updated = queryset.filter(pk=self.pk).update(**changes)
+        if not updated:
+            return False
+
+        for field, value in changes.items():
+            setattr(self, field, value)
+        Enrollment.course.field.related_model.refresh_enrollment_count(self.course_id)
+        return True
+
     def activate(self, transaction_id: Optional[str] = None):
         """
         Activate enrollment after payment confirmation.
@@ -254,46 +368,32 @@ class Enrollment(models.Model):
         Returns:
             bool: True if activated, False if already active
         """
-        if self.status == self.STATUS_ACTIVE:
-            return False
-
-        self.status = self.STATUS_ACTIVE
-        self.activated_at = timezone.now()
-
+        changes = {"status": self.STATUS_ACTIVE, "activated_at": timezone.now()}
         if transaction_id:
-            self.transaction_id = transaction_id
+            changes["transaction_id"] = transaction_id
 
-        self.save(
-            update_fields=["status", "activated_at", "transaction_id", "updated_at"]
+        activated = self._transition(
+            Enrollment.objects.exclude(status=self.STATUS_ACTIVE), **changes
         )
 
         # TODO: Send enrollment confirmation email
         # from .tasks import send_enrollment_confirmation
 
-        return True
+        return activated
 
     def complete(self):
         """Mark enrollment as completed"""
-        if self.status == self.STATUS_COMPLETED:
-            return False
-
-        self.status = self.STATUS_COMPLETED
-        self.completion_percentage = Decimal("100.00")
-        self.completed_at = timezone.now()
-
-        self.save(
-            update_fields=[
-                "status",
-                "completion_percentage",
-                "completed_at",
-                "updated_at",
-            ]
+        completed = self._transition(
+            Enrollment.objects.exclude(status=self.STATUS_COMPLETED),
+            status=self.STATUS_COMPLETED,
+            completion_percentage=MAX_PROGRESS,
+            completed_at=timezone.now(),
         )
 
         # TODO: Send completion certificate
         # from .tasks import send_completion_certificate
 
-        return True
+        return completed
 
     def cancel(self, reason: str = ""):
         """
@@ -305,17 +405,13 @@ class Enrollment(models.Model):
         Returns:
             bool: True if cancelled, False if already cancelled
         """
-        if self.status in [self.STATUS_CANCELLED, self.STATUS_REFUNDED]:
-            return False
-
-        self.status = self.STATUS_CANCELLED
-
+        changes = {"status": self.STATUS_CANCELLED}
         if reason:
-            self.refund_reason = reason
-
-        self.save(update_fields=["status", "refund_reason", "updated_at"])
+            changes["refund_reason"] = reason
 
-        return True
+        return self._transition(
+            Enrollment.objects.exclude(status__in=self.CLOSED_STATUSES), **changes
+        )
 
     def refund(self, amount: Decimal, reason: str = ""):
         """
@@ -328,33 +424,77 @@ class Enrollment(models.Model):
         Returns:
             bool: True if refunded successfully
         """
-        if self.status == self.STATUS_REFUNDED:
-            return False
-
         # Validate refund amount
+        if amount < 0:
+            raise ValidationError(_("Refund amount cannot be negative"))
         if amount > self.price_paid:
             raise ValidationError(_("Refund amount cannot exceed price paid"))
 
-        self.status = self.STATUS_REFUNDED
-        self.refund_amount = amount
-        self.refund_reason = reason
-        self.refunded_at = timezone.now()
-
-        self.save(
-            update_fields=[
-                "status",
-                "refund_amount",
-                "refund_reason",
-                "refunded_at",
-                "updated_at",
-            ]
+        refunded = self._transition(
+            Enrollment.objects.exclude(status=self.STATUS_REFUNDED),
+            status=self.STATUS_REFUNDED,
+            refund_amount=amount,
+            refund_reason=reason,
+            refunded_at=timezone.now(),
         )
 
         # TODO: Process payment gateway refund
         # from .tasks import process_payment_refund
         # process_payment_refund.delay(self.id, amount)
 
-        return True
+        return refunded
+
+    @classmethod
+    def _bulk_transition(cls, queryset, **changes):
+        """
+        Apply ``changes`` to every row of ``queryset`` with one UPDATE.
+
+        Returns:
+            int: Number of enrollments updated
+        """
+        course_ids = set(queryset.values_list("course_id", flat=True))
+        if not course_ids:
+            return 0
+
+        cls._validate_changes(queryset, changes)
+
+        # UPDATE the caller's guarded queryset itself, so a row that left the
+        # guard after the probe above is not overwritten
+        changes["updated_at"] = timezone.now()
+        updated = queryset.update(**changes)
+        if updated:
+            cls.course.field.related_model.refresh_enrollment_count(*course_ids)
+        return updated
+
+    @classmethod
+    def bulk_activate(cls, queryset):
+        """Activate every enrollment in ``queryset`` that isn't active yet"""
+        return cls._bulk_transition(
+            queryset.exclude(status=cls.STATUS_ACTIVE),
+            status=cls.STATUS_ACTIVE,
+            activated_at=timezone.now(),
+        )
+
+    @classmethod
+    def bulk_complete(cls, queryset):
+        """Complete every enrollment in ``queryset`` that isn't completed yet"""
+        return cls._bulk_transition(
+            queryset.exclude(status=cls.STATUS_COMPLETED),
+            status=cls.STATUS_COMPLETED,
+            completion_percentage=MAX_PROGRESS,
+            completed_at=timezone.now(),
+        )
+
+    @classmethod
+    def bulk_cancel(cls, queryset, reason: str = ""):
+        """Cancel every enrollment in ``queryset`` that isn't closed yet"""
+        changes = {"status": cls.STATUS_CANCELLED}
+        if reason:
+            changes["refund_reason"] = reason
+
+        return cls._bulk_transition(
+            queryset.exclude(status__in=cls.CLOSED_STATUSES), **changes
+        )
 
     def update_progress(self, percentage: Decimal):
         """
@@ -363,26 +503,22 @@ class Enrollment(models.Model):
         Args:
             percentage: Completion percentage (0-100)
         """
-        if not (Decimal("0.00") <= percentage <= Decimal("100.00")):
+        if not (MIN_PROGRESS <= percentage <= MAX_PROGRESS):
             raise ValueError("Percentage must be between 0 and 100")
 
         self.completion_percentage = percentage
         self.last_accessed_at = timezone.now()
 
+        update_fields = ["completion_percentage", "last_accessed_at", "updated_at"]
+
         # Auto-complete if 100%
-        if percentage == Decimal("100.00") and not self.completed_at:
+        if percentage == MAX_PROGRESS and not self.completed_at:
             self.completed_at = timezone.now()
             self.status = self.STATUS_COMPLETED
+            # Only a status change can move the course's enrollment count
+            update_fields += ["completed_at", "status"]
 
-        self.save(
-            update_fields=[
-                "completion_percentage",
-                "last_accessed_at",
-                "completed_at",
-                "status",
-                "updated_at",
-            ]
-        )
+        self.save(update_fields=update_fields, skip_validation=True)
 
     @property
     def is_active(self):
@@ -447,7 +583,12 @@ class Review(models.Model):
             models.Index(fields=["course"]),
             models.Index(fields=["course", "rating"]),
         ]
-        unique_together = [["student", "course"]]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["student", "course"],
+                name="uniq_review_per_student_course",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.course.title} - Rating: {self.rating}"
@@ -460,16 +601,39 @@ class Review(models.Model):
         if not self.student_id or not self.course_id:
             return
 
+        # Filter on the raw ids so the student and course rows aren't loaded
         has_enrollment = Enrollment.objects.filter(
-            student=self.student,
-            course=self.course,
-            status__in=[Enrollment.STATUS_ACTIVE, Enrollment.STATUS_COMPLETED],
+            student_id=self.student_id,
+            course_id=self.course_id,
+            status__in=Enrollment.ENROLLED_STATUSES,
         ).exists()
 
         if not has_enrollment:
-            raise ValidationError(
-                {"student": _("Student must be enrolled to review the course.")}
-            )
+            raise ValidationError({"student": REVIEW_NOT_ENROLLED_ERROR})
+
+    @classmethod
+    def bulk_validate(cls, reviews):
+        """
+        Run the enrollment check for many reviews with a single query.
+
+        Meant for imports: validate once, then ``bulk_create`` the reviews or
+        save them with ``skip_validation=True``.
+
+        Raises:
+            ValidationError: If any review's student isn't enrolled
+        """
+        reviews = list(reviews)
+        enrolled = set(
+            Enrollment.objects.filter(
+                student_id__in={review.student_id for review in reviews},
+                course_id__in={review.course_id for review in reviews},
+                status__in=Enrollment.ENROLLED_STATUSES,
+            ).values_list("student_id", "course_id")
+        )
+        if any(
+            (review.student_id, review.course_id) not in enrolled for review in reviews
+        ):
+            raise ValidationError({"student": REVIEW_NOT_ENROLLED_ERROR})
 
     def save(self, *args, **kwargs):
         if not kwargs.pop("skip_validation", False):
@@ -14,21 +14,103 @@ from django.contrib.auth import get_user_model
 from django.utils.text import slugify
 from django.conf import settings
 from django.db import models
+from django.utils.functional import cached_property
+from django.utils import timezone
 from decimal import Decimal
 import os
+from functools import lru_cache
 
 User = get_user_model()
 
+# Video duration bounds, in seconds (also enforced by a DB check constraint)
+MIN_VIDEO_DURATION = 1
+MAX_VIDEO_DURATION = 14400  # 4 hours
+
 # =====================
 # CUSTOM VALIDATORS
 # =====================
 def validate_video_duration(value):
     """Validate video duration (1 second to 4 hours)"""
-    if not (1 <= value <= 14400):  # 4 hours = 14400 seconds
+    if not (MIN_VIDEO_DURATION <= value <= MAX_VIDEO_DURATION):
         raise ValidationError(
             f"Video duration must be between 1 second and 4 hours. Got: {value} seconds"
         )
 
+# =====================
+# FORMATTING HELPERS
+# =====================
+@lru_cache(maxsize=4096)
+def format_duration(total_seconds):
+    """
+    Human-readable duration (e.g., '1h 30m' or '45m').
+    
+    Memoized: durations are bounded (1s to 4h) and lesson lengths repeat,
+    so list renders mostly hit the cache.
+    """
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    
+    if hours > 0:
+        return f"{hours}h {minutes}m"
+    elif minutes > 0:
+        return f"{minutes}m {seconds}s" if seconds > 0 else f"{minutes}m"
+    else:
+        return f"{seconds}s"
+
+# =====================
+# LESSON MANAGER
+# =====================
+
+class LessonManager(models.Manager):
+    """Default manager with a batch path for trusted imports"""
+    
+    def bulk_create_validated(self, lessons):
+        """
+        Validate a batch of lessons once, then insert it with bulk_create().
+        
+        Field validators run in Python (no per-row full_clean()), and the
+        (chapter, title) / (chapter, order) uniqueness is checked with one
+        query against existing rows plus a pass over the batch itself.
+        
+        Raises:
+            ValidationError: If any lesson is invalid or collides
+        """
+        lessons = list(lessons)
+        errors = {}
+        for index, lesson in enumerate(lessons):
+            try:
+                lesson.clean_fields(exclude=['chapter'])
+            except ValidationError as e:
+                errors[index] = e.messages
+        
+        chapter_ids = {lesson.chapter_id for lesson in lessons}
+        existing = self.filter(chapter_id__in=chapter_ids).filter(
+            models.Q(title__in={lesson.title for lesson in lessons})
+            | models.Q(order__in={lesson.order for lesson in lessons})
+        ).values_list('chapter_id', 'title', 'order')
+        taken_titles, taken_orders = set(), set()
+        for chapter_id, title, order in existing:
+            taken_titles.add((chapter_id, title))
+            taken_orders.add((chapter_id, order))
+        
+        for index, lesson in enumerate(lessons):
+            title_key = (lesson.chapter_id, lesson.title)
+            order_key = (lesson.chapter_id, lesson.order)
+            if title_key in taken_titles or order_key in taken_orders:
+                errors.setdefault(index, []).append(
+                    'A lesson with this title or order already exists in the chapter.'
+                )
+            taken_titles.add(title_key)
+            taken_orders.add(order_key)
+        
+        if errors:
+            raise ValidationError(
+                {'lessons': [f"#{index}: {'; '.join(messages)}"
+                             for index, messages in sorted(errors.items())]}
+            )
+        return self.bulk_create(lessons)
+
 # =====================
 # LESSON MODEL
 # =====================
@@ -74,25 +156,42 @@ class Lesson(models.Model):
     
     is_preview = models.BooleanField(
         default=False,
-        db_index=True,
         help_text="Free preview lesson (accessible without enrollment)"
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = LessonManager()
+    
     class Meta:
         verbose_name = 'Lesson'
         verbose_name_plural = 'Lessons'
         ordering = ['chapter', 'order']
         indexes = [
             models.Index(fields=['chapter', 'order']),
-            models.Index(fields=['is_preview']),
+            # Preview listings filter by chapter and read back in order;
+            # only preview rows are ever looked up, so index just those
+            models.Index(
+                fields=['chapter', 'order'],
+                condition=models.Q(is_preview=True),
+                name='lesson_preview_partial_idx'
+            ),
         ]
         unique_together = [
             ['chapter', 'title'],
             ['chapter', 'order'],  # Unique order per chapter
         ]
+        constraints = [
+            # Keeps bulk paths that skip full_clean() within the validator's range
+            models.CheckConstraint(
+                condition=models.Q(
+                    duration_seconds__gte=MIN_VIDEO_DURATION,
+                    duration_seconds__lte=MAX_VIDEO_DURATION,
+                ),
+                name='lesson_duration_bounds'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.chapter.title} - {self.title}"
@@ -104,7 +203,7 @@ class Lesson(models.Model):
         # Auto-assign next order if not provided
         if not self.order and self.chapter_id:
             max_order = Lesson.objects.filter(
-                chapter=self.chapter
+                chapter_id=self.chapter_id
             ).aggregate(models.Max('order'))['order__max']
             self.order = (max_order or 0) + 1
     
@@ -112,11 +211,36 @@ class Lesson(models.Model):
         if not kwargs.pop('skip_validation', False):
             self.full_clean()
         super().save(*args, **kwargs)
+        # The chapter may have changed; resolve the course again on next access
+        self.__dict__.pop('course', None)
+    
+    @classmethod
+    def bulk_create_ordered(cls, lessons):
+        """
+        Append lessons to their chapters with one MAX query and one INSERT.
+        
+        Orders continue after each chapter's current last lesson, in the
+        order given. Per-row full_clean() is skipped, like bulk_create().
+        """
+        lessons = list(lessons)
+        next_order = dict(
+            cls.objects.filter(
+                chapter_id__in={lesson.chapter_id for lesson in lessons}
+            )
+            .order_by()
+            .values('chapter_id')
+            .annotate(max_order=models.Max('order'))
+            .values_list('chapter_id', 'max_order')
+        )
+        for lesson in lessons:
+            lesson.order = next_order.get(lesson.chapter_id, 0) + 1
+            next_order[lesson.chapter_id] = lesson.order
+        return cls.objects.bulk_create(lessons)
     
     # Helper properties
-    @property
+    @cached_property
     def course(self):
-        """Access parent course via chapter"""
+        """Access parent course via chapter (cached per instance)"""
         return self.chapter.course
     
     @property
@@ -127,32 +251,35 @@ class Lesson(models.Model):
     @property
     def formatted_duration(self):
         """Human-readable duration (e.g., '1h 30m' or '45m')"""
-        total_seconds = self.duration_seconds
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
-        
-        if hours > 0:
-            return f"{hours}h {minutes}m"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s" if seconds > 0 else f"{minutes}m"
-        else:
-            return f"{seconds}s"
+        return format_duration(self.duration_seconds)
     
     @property
     def resources_count(self):
-        """Total resources (if model exists)"""
+        """Total resources (``_resources_count`` annotation, if model exists)"""
+        if '_resources_count' in self.__dict__:
+            return self._resources_count
         return self.resources_of_lesson.count() if hasattr(self, 'resources_of_lesson') else 0
     
     @property
     def quizzes_count(self):
-        """Total quizzes (if model exists)"""
+        """Total quizzes (``_quizzes_count`` annotation, if model exists)"""
+        if '_quizzes_count' in self.__dict__:
+            return self._quizzes_count
         return self.quizzes_of_lesson.count() if hasattr(self, 'quizzes_of_lesson') else 0
     
     def set_preview(self, is_preview=True):
-        """Toggle preview status"""
+        """
+        Toggle preview status with a single UPDATE.
+        
+        Bypasses full_clean() and save() signals on purpose: flipping the
+        flag can't break any lesson invariant.
+        """
+        now = timezone.now()
+        Lesson.objects.filter(pk=self.pk).update(
+            is_preview=is_preview, updated_at=now
+        )
         self.is_preview = is_preview
-        self.save(update_fields=['is_preview', 'updated_at'])
+        self.updated_at = now
     
     def enable_preview(self):
         """Make lesson available as preview"""
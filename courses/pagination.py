@@ -0,0 +1,9 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class CoursePagination(PageNumberPagination):
+    """Page course listings: one COUNT(*) plus a LIMITed page query."""
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Course, Enrollment
+
+# Enrollment fields the course's enrollment count depends on
+_COUNTED_FIELDS = frozenset({"status", "course"})
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def refresh_course_enrollment_count(sender, instance, **kwargs):
+    """Keep ``Course.enrollment_count_cache`` in step with enrollment writes."""
+    # post_delete passes neither flag, so deletes always refresh
+    update_fields = kwargs.get("update_fields")
+    if (
+        not kwargs.get("created")
+        and update_fields is not None
+        and _COUNTED_FIELDS.isdisjoint(update_fields)
+    ):
+        # Progress, payment and coupon saves can't change the count
+        return
+    Course.refresh_enrollment_count(instance.course_id)
@@ -1,10 +1,15 @@
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.db.models.query import QuerySet
+from django.core.exceptions import ValidationError
 from courses.models.course_models import Course, Subject, Education
+from courses.models.interactionCourse_models import Enrollment, Review
 from users.models import Teacher, Student
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-import io
-from PIL import Image
+from users.tests.utils import encode_jpeg
 
 User = get_user_model()
 
@@ -41,6 +46,11 @@ class SubjectModelTest(TestCase):
 
 class CourseModelTest(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        # Encode once per class; wrapping the bytes per test is cheap
+        cls.img_300 = encode_jpeg(300, 300)
+
     def setUp(self):
         self.teacher_user = User.objects.create_user(
             username="teacheruser", password="password123", user_type="teacher"
@@ -63,12 +73,8 @@ class CourseModelTest(TestCase):
         )
 
         # Create a dummy image file with updated dimensions
-        file_io = io.BytesIO()
-        image = Image.new("RGB", (300, 300), color="white")
-        image.save(file_io, "JPEG")
-        file_io.seek(0)
         temp_img = SimpleUploadedFile(
-            name="test_image.jpg", content=file_io.read(), content_type="image/jpeg"
+            name="test_image.jpg", content=self.img_300, content_type="image/jpeg"
         )
 
         self.course = Course.objects.create(
@@ -86,6 +92,26 @@ class CourseModelTest(TestCase):
         self.assertTrue(self.course.is_active)
         self.assertFalse(self.course.is_published)
 
+    def test_slug_collision_gets_suffix(self):
+        self.assertEqual(self.course.slug, "algebra-101")
+        other = Course.objects.create(
+            teacher=self.teacher,
+            education=self.education,
+            title="Algebra 101!",
+            description="Same slug, different title.",
+            price=100.00,
+        )
+        self.assertEqual(other.slug, "algebra-101-1")
+
+    def test_save_validates_only_when_requested(self):
+        self.course.price = 1
+        self.course.save(update_fields=["price", "updated_at"])
+        # The other models' opt-out flag is accepted for compatibility
+        self.course.save(skip_validation=True)
+
+        with self.assertRaises(ValidationError):
+            self.course.save(run_validation=True)
+
     def test_soft_delete(self):
         self.course.soft_delete()
         self.assertFalse(self.course.is_active)
@@ -93,6 +119,17 @@ class CourseModelTest(TestCase):
         self.assertIsNotNone(self.course.deleted_at)
         self.assertTrue(Course.objects.filter(pk=self.course.pk).exists())
 
+    def test_soft_deleted_course_title_can_be_reused(self):
+        self.course.soft_delete()
+        other = Course.objects.create(
+            teacher=self.teacher,
+            education=self.education,
+            title="Algebra 101",
+            description="Replacement course.",
+            price=100.00,
+        )
+        self.assertTrue(other.is_active)
+
     def test_publish_method(self):
         self.course.publish()
         self.assertTrue(self.course.is_published)
@@ -141,3 +178,188 @@ class CourseModelTest(TestCase):
         self.assertEqual(stats["average_rating"], 0)
         self.assertEqual(stats["chapters"], 0)
         self.assertEqual(stats["lessons"], 0)
+
+    def test_get_course_stats_single_query(self):
+        self.course.is_published = True
+        self.course.save()
+        for index, rating in enumerate((4, 2)):
+            user = User.objects.create_user(
+                username=f"stats{index}", password="password123", user_type="student"
+            )
+            student = Student.objects.create(
+                user=user, phone=f"0101234567{index}", parent_phone="01098765432"
+            )
+            Enrollment.objects.create(
+                student=student,
+                course=self.course,
+                status=Enrollment.STATUS_ACTIVE,
+                original_price=100,
+                price_paid=100,
+                payment_method=Enrollment.PAYMENT_CREDIT_CARD,
+            )
+            Review.objects.create(student=student, course=self.course, rating=rating)
+
+        with self.assertNumQueries(1):
+            stats = self.course.get_course_stats()
+        self.assertEqual(stats["enrollments"], 2)
+        self.assertEqual(stats["revenue"], 200)
+        self.assertEqual(stats["reviews"], 2)
+        self.assertEqual(stats["average_rating"], 3)
+
+    def test_with_counts_annotates_count_properties(self):
+        course = Course.with_counts().get(pk=self.course.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(course.enrollment_count, 0)
+            self.assertEqual(course.chapter_count, 0)
+            self.assertEqual(course.lesson_count, 0)
+
+    def test_review_count_uses_prefetched_reviews(self):
+        course = Course.objects.prefetch_related("course_reviews").get(
+            pk=self.course.pk
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(course.review_count, 0)
+            self.assertEqual(course.review_count, 0)
+
+
+class EnrollmentModelTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher_user = User.objects.create_user(
+            username="teacher1", password="password123", user_type="teacher"
+        )
+        teacher = Teacher.objects.create(user=teacher_user, is_verified=True)
+        student_user = User.objects.create_user(
+            username="student", password="password123", user_type="student"
+        )
+        cls.student = Student.objects.create(
+            user=student_user, phone="01012345678", parent_phone="01098765432"
+        )
+        cls.course = Course.objects.create(
+            title="Course 1",
+            description="Description 1",
+            price=100,
+            teacher=teacher,
+            is_published=True,
+        )
+
+    def enroll(self):
+        return Enrollment.objects.create(
+            student=self.student,
+            course=self.course,
+            status=Enrollment.STATUS_ACTIVE,
+            original_price=100,
+            payment_method=Enrollment.PAYMENT_CREDIT_CARD,
+        )
+
+    def test_review_bulk_validate_checks_enrollment_once(self):
+        review = Review(student=self.student, course=self.course, rating=4)
+        with self.assertRaises(ValidationError):
+            Review.bulk_validate([review])
+
+        self.enroll()
+        with self.assertNumQueries(1):
+            Review.bulk_validate([review])
+
+    def test_enrollment_transitions_update_guarded_rows(self):
+        enrollment = self.enroll()
+        # The enrollment UPDATE plus the course counter refresh
+        with self.assertNumQueries(2):
+            self.assertTrue(enrollment.complete())
+        enrollment.refresh_from_db()
+        self.assertEqual(enrollment.status, Enrollment.STATUS_COMPLETED)
+        self.assertIsNotNone(enrollment.completed_at)
+
+        # A stale instance loses the race: the status predicate matches no row
+        stale = Enrollment.objects.get(pk=enrollment.pk)
+        stale.status = Enrollment.STATUS_ACTIVE
+        with self.assertNumQueries(1):
+            self.assertFalse(stale.complete())
+
+    def test_transitions_keep_field_validation(self):
+        enrollment = self.enroll()
+        with self.assertRaises(ValidationError):
+            enrollment.refund(Decimal("-5"))
+        enrollment.refresh_from_db()
+        self.assertIsNone(enrollment.refund_amount)
+
+        enrollment.cancel()
+        enrollment.activate(transaction_id="txn-1")
+        other_user = User.objects.create_user(
+            username="student2", password="password123", user_type="student"
+        )
+        other = Enrollment.objects.create(
+            student=Student.objects.create(
+                user=other_user, phone="01012345679", parent_phone="01098765433"
+            ),
+            course=self.course,
+            status=Enrollment.STATUS_PENDING,
+            original_price=100,
+            payment_method=Enrollment.PAYMENT_CREDIT_CARD,
+        )
+        with self.assertRaises(ValidationError) as ctx:
+            other.activate(transaction_id="txn-1")
+        self.assertIn("transaction_id", ctx.exception.message_dict)
+        # Re-activating with its own transaction id isn't a conflict
+        enrollment.cancel()
+        self.assertTrue(enrollment.activate(transaction_id="txn-1"))
+
+    def test_course_enrollment_count_follows_enrollments(self):
+        enrollment = self.enroll()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.enrollment_count, 1)
+
+        enrollment.cancel()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.enrollment_count, 0)
+
+    def test_progress_saves_skip_the_enrollment_count_refresh(self):
+        enrollment = self.enroll()
+        # Just the enrollment UPDATE: status is untouched below 100%
+        with self.assertNumQueries(1):
+            enrollment.update_progress(Decimal("50"))
+        # Auto-completing changes status, so the course counter is refreshed
+        with self.assertNumQueries(2):
+            enrollment.update_progress(Decimal("100"))
+        self.assertEqual(enrollment.status, Enrollment.STATUS_COMPLETED)
+
+    def test_bulk_cancel_updates_once_and_skips_closed(self):
+        self.enroll()
+        with self.assertNumQueries(3):
+            self.assertEqual(Enrollment.bulk_cancel(Enrollment.objects.all()), 1)
+        self.assertEqual(Enrollment.bulk_cancel(Enrollment.objects.all()), 0)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.enrollment_count, 0)
+
+    def test_bulk_transitions_keep_field_validation(self):
+        self.enroll()
+        with self.assertRaises(ValidationError):
+            Enrollment._bulk_transition(
+                Enrollment.objects.all(), refund_amount=Decimal("-1")
+            )
+        # A unique value can't be written to several rows at once
+        Enrollment.objects.update(status=Enrollment.STATUS_CANCELLED)
+        self.enroll()
+        with self.assertRaises(ValidationError):
+            Enrollment._bulk_transition(
+                Enrollment.objects.all(), transaction_id="txn-1"
+            )
+        self.assertFalse(Enrollment.objects.filter(transaction_id="txn-1").exists())
+
+    def test_bulk_cancel_keeps_rows_closed_after_the_probe(self):
+        enrollment = self.enroll()
+        values_list = QuerySet.values_list
+
+        def refund_after_probe(qs, *args, **kwargs):
+            probe = list(values_list(qs, *args, **kwargs))
+            Enrollment.objects.filter(pk=enrollment.pk).update(
+                status=Enrollment.STATUS_REFUNDED
+            )
+            return probe
+
+        with mock.patch.object(
+            QuerySet, "values_list", autospec=True, side_effect=refund_after_probe
+        ):
+            self.assertEqual(Enrollment.bulk_cancel(Enrollment.objects.all()), 0)
+        enrollment.refresh_from_db()
+        self.assertEqual(enrollment.status, Enrollment.STATUS_REFUNDED)
@@ -1,12 +1,20 @@
 from rest_framework import serializers
 from rest_framework.test import APITestCase
 from ..models.course_models import Course, Education, Subject
+from ..models.interactionCourse_models import Enrollment, Review
 from ..Serializers.course_serializers import (
     CourseListSerializer,
     CourseDetailSerializer,
     CourseCreateUpdateSerializer,
 )
-from users.models import Teacher, User
+from ..Serializers.interactionCourse_serializers import (
+    CourseEnrollmentCreateSerializer,
+    CourseEnrollmentDetailSerializer,
+    CourseEnrollmentListSerializer,
+    CourseReviewCreateSerializer,
+    CourseReviewSerializer,
+)
+from users.models import Student, Teacher, User
 
 
 class CourseSerializerTests(APITestCase):
@@ -47,6 +55,10 @@ class CourseSerializerTests(APITestCase):
         self.assertEqual(serializer.data["price"], "100.00")
         self.assertEqual(serializer.data["teacher_name"], self.user1.username)
 
+    def test_course_list_serializer_price_from_database(self):
+        course = Course.objects.get(pk=self.course1.pk)
+        self.assertEqual(CourseListSerializer(course).data["price"], "100.00")
+
     def test_course_detail_serializer(self):
         serializer = CourseDetailSerializer(self.course1)
         self.assertEqual(serializer.data["title"], self.course1.title)
@@ -78,3 +90,166 @@ class CourseSerializerTests(APITestCase):
         course = serializer.save(teacher=self.teacher1)
         self.assertEqual(course.title, data["title"])
         self.assertEqual(course.price, data["price"])
+
+    def test_course_create_rejects_inactive_education(self):
+        self.education.is_active = False
+        self.education.save()
+        data = {
+            "title": "New Course",
+            "description": "New course description",
+            "price": 150,
+            "education": self.education.id,
+        }
+        request = self.client
+        request.user = self.user1
+        serializer = CourseCreateUpdateSerializer(
+            data=data, context={"request": request}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("education", serializer.errors)
+
+
+class CourseReviewSerializerTests(APITestCase):
+    def setUp(self):
+        teacher_user = User.objects.create_user(
+            username="teacher1", password="password123", user_type="teacher"
+        )
+        teacher = Teacher.objects.create(user=teacher_user, is_verified=True)
+        self.student_user = User.objects.create_user(
+            username="student", password="password123", user_type="student"
+        )
+        self.student = Student.objects.create(
+            user=self.student_user, phone="01012345678", parent_phone="01098765432"
+        )
+        self.course = Course.objects.create(
+            title="Course 1",
+            description="Description 1",
+            price=100,
+            teacher=teacher,
+            is_published=True,
+        )
+        request = self.client
+        request.user = self.student_user
+        self.context = {"request": request}
+
+    def enroll(self):
+        return Enrollment.objects.create(
+            student=self.student,
+            course=self.course,
+            status=Enrollment.STATUS_ACTIVE,
+            original_price=100,
+            payment_method=Enrollment.PAYMENT_CREDIT_CARD,
+        )
+
+    def test_review_requires_enrollment(self):
+        serializer = CourseReviewCreateSerializer(
+            data={"course": self.course.id, "rating": 4}, context=self.context
+        )
+        self.assertFalse(serializer.is_valid())
+
+    def test_enrolled_student_can_review_once(self):
+        self.enroll()
+        serializer = CourseReviewCreateSerializer(
+            data={"course": self.course.id, "rating": 4}, context=self.context
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        review = serializer.save()
+        self.assertEqual(
+            serializer.data,
+            {"id": review.id, "course": self.course.id, "rating": "4.0"},
+        )
+
+        serializer = CourseReviewCreateSerializer(
+            data={"course": self.course.id, "rating": 5}, context=self.context
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(serializers.ValidationError):
+            serializer.save()
+        self.assertEqual(Review.objects.filter(student=self.student).count(), 1)
+
+    def test_moving_review_onto_reviewed_course_is_rejected(self):
+        other_course = Course.objects.create(
+            title="Course 2",
+            description="Description 2",
+            price=100,
+            teacher=self.course.teacher,
+            is_published=True,
+        )
+        self.enroll()
+        Enrollment.objects.create(
+            student=self.student,
+            course=other_course,
+            status=Enrollment.STATUS_ACTIVE,
+            original_price=100,
+            payment_method=Enrollment.PAYMENT_CREDIT_CARD,
+        )
+        review = Review.objects.create(
+            student=self.student, course=self.course, rating=4
+        )
+        Review.objects.create(student=self.student, course=other_course, rating=5)
+
+        serializer = CourseReviewCreateSerializer(
+            review,
+            data={"course": other_course.id, "rating": 3},
+            context=self.context,
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(serializers.ValidationError):
+            serializer.save()
+        review.refresh_from_db()
+        self.assertEqual(review.course_id, self.course.id)
+
+    def test_student_can_reenroll_after_cancelling(self):
+        self.enroll().cancel()
+        serializer = CourseEnrollmentCreateSerializer(
+            data={
+                "course": self.course.id,
+                "payment_method": Enrollment.PAYMENT_CREDIT_CARD,
+            },
+            context=self.context,
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        serializer = CourseEnrollmentCreateSerializer(
+            data={
+                "course": self.course.id,
+                "payment_method": Enrollment.PAYMENT_CREDIT_CARD,
+            },
+            context=self.context,
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(serializers.ValidationError):
+            serializer.save()
+
+    def test_enrollment_detail_teacher_name_from_annotation(self):
+        teacher_user = self.course.teacher.user
+        teacher_user.first_name = "Ada"
+        teacher_user.last_name = "Lovelace"
+        teacher_user.save()
+        enrollment = CourseEnrollmentDetailSerializer.prefetch_queryset(
+            Enrollment.objects.all()
+        ).get(pk=self.enroll().pk)
+
+        with self.assertNumQueries(0):
+            course_info = CourseEnrollmentDetailSerializer(enrollment).data[
+                "course_info"
+            ]
+        self.assertEqual(course_info["teacher_name"], teacher_user.get_full_name())
+
+        # Instances loaded without prefetch_queryset fall back to the relation
+        plain = Enrollment.objects.get(pk=enrollment.pk)
+        course_info = CourseEnrollmentDetailSerializer(plain).data["course_info"]
+        self.assertEqual(course_info["teacher_name"], "Ada Lovelace")
+
+    def test_list_serializers_render_pruned_rows_without_queries(self):
+        self.enroll()
+        Review.objects.create(student=self.student, course=self.course, rating=4)
+        for serializer_class, model in [
+            (CourseEnrollmentListSerializer, Enrollment),
+            (CourseReviewSerializer, Review),
+        ]:
+            rows = list(serializer_class.prefetch_queryset(model.objects.all()))
+            with self.assertNumQueries(0):
+                data = serializer_class(rows, many=True).data
+            self.assertEqual(data[0]["student_name"], "student")
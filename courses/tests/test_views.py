@@ -1,8 +1,11 @@
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from courses.models.course_models import Course
-from users.models import Teacher
+from courses.models.interactionCourse_models import Enrollment
+from courses.views.course_views import CourseViewSet
+from users.models import Student, Teacher
 from courses.Serializers.course_serializers import (
     CourseListSerializer,
     CourseDetailSerializer,
@@ -11,55 +14,107 @@ from django.urls import reverse
 
 User = get_user_model()
 
+COURSE_LIST = "/course-api/courses/"
+COURSE_DETAIL = "/course-api/courses/{pk}/"
+
 
 class CourseViewSetTests(APITestCase):
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         # Create users
-        self.user1 = User.objects.create_user(
+        cls.user1 = User.objects.create_user(
             username="teacher1", password="password123", user_type="teacher"
         )
-        self.user2 = User.objects.create_user(
+        cls.user2 = User.objects.create_user(
             username="teacher2", password="password123", user_type="teacher"
         )
-        self.student = User.objects.create_user(
+        cls.student = User.objects.create_user(
             username="student", password="password123", user_type="student"
         )
 
         # Create teacher profiles
-        self.teacher1 = Teacher.objects.create(user=self.user1)
-        self.teacher2 = Teacher.objects.create(user=self.user2)
+        cls.teacher1 = Teacher.objects.create(user=cls.user1)
+        cls.teacher2 = Teacher.objects.create(user=cls.user2)
 
         # Create courses
-        self.course1 = Course.objects.create(
+        cls.course1 = Course.objects.create(
             title="Course 1",
             description="Description 1",
             price=100,
-            teacher=self.teacher1,
+            teacher=cls.teacher1,
             is_published=True,
         )
-        self.course2 = Course.objects.create(
+        cls.course2 = Course.objects.create(
             title="Course 2",
             description="Description 2",
             price=200,
-            teacher=self.teacher1,
+            teacher=cls.teacher1,
             is_published=False,
         )
 
-        # Initialize API client
-        self.client = APIClient()
+    def test_url_constants_match_router(self):
+        self.assertEqual(reverse("course-list"), COURSE_LIST)
+        self.assertEqual(
+            reverse("course-detail", kwargs={"pk": 1}), COURSE_DETAIL.format(pk=1)
+        )
 
     def test_list_permissions_allow_any(self):
-        url = reverse("course-list")
+        url = COURSE_LIST
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_retrieve_permissions_allow_any(self):
-        url = reverse("course-detail", kwargs={"pk": self.course1.id})
+        url = COURSE_DETAIL.format(pk=self.course1.id)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_list_uses_count_and_page_queries(self):
+        url = COURSE_LIST
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["teacher_name"], self.user1.username
+        )
+
+    def test_list_query_count_independent_of_teachers(self):
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f"extra{i}", password="password123", user_type="teacher"
+            )
+            Course.objects.create(
+                title=f"Extra {i}",
+                description="Description",
+                price=50,
+                teacher=Teacher.objects.create(user=user),
+                is_published=True,
+            )
+        with self.assertNumQueries(2):
+            response = self.client.get(COURSE_LIST)
+        self.assertEqual(
+            {course["teacher_name"] for course in response.data["results"]},
+            {"teacher1", "extra0", "extra1", "extra2"},
+        )
+
+    def test_get_queryset_built_once_per_request(self):
+        view = CourseViewSet(action="list")
+        view.request = APIRequestFactory().get(COURSE_LIST)
+        view.request.user = AnonymousUser()
+        self.assertIs(view.get_queryset(), view.get_queryset())
+        # A new view instance (i.e. a new request) builds its own queryset
+        other = CourseViewSet(action="list", request=view.request)
+        self.assertIsNot(other.get_queryset(), view.get_queryset())
+
+    def test_retrieve_annotates_course_stats(self):
+        url = COURSE_DETAIL.format(pk=self.course1.id)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["enrollment_count"], 0)
+        self.assertEqual(response.data["review_count"], 0)
+
     def test_create_permissions_authenticated(self):
-        url = reverse("course-list")
+        url = COURSE_LIST
         # Unauthenticated user
         response = self.client.post(
             url,
@@ -87,7 +142,7 @@ class CourseViewSetTests(APITestCase):
 
     def test_delete_permissions_owner_only(self):
 
-        url = reverse("course-detail", kwargs={"pk": self.course1.id})
+        url = COURSE_DETAIL.format(pk=self.course1.id)
         self.client.force_authenticate(user=self.user2)
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -97,16 +152,17 @@ class CourseViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
     def test_list_serializer_logic(self):
-        url = reverse("course-list")
+        url = COURSE_LIST
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(
-            response.data[0].keys(), CourseListSerializer(self.course1).data.keys()
+            response.data["results"][0].keys(),
+            CourseListSerializer(self.course1).data.keys(),
         )
 
     def test_retrieve_serializer_logic(self):
-        url = reverse("course-detail", kwargs={"pk": self.course1.id})
+        url = COURSE_DETAIL.format(pk=self.course1.id)
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -115,20 +171,20 @@ class CourseViewSetTests(APITestCase):
         )
 
     def test_queryset_filtering(self):
-        url = reverse("course-list")
+        url = COURSE_LIST
         # Anonymous user
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # Only published courses
+        self.assertEqual(response.data["count"], 1)  # Only published courses
 
         # Authenticated teacher
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # All courses for the teacher
+        self.assertEqual(response.data["count"], 2)  # All courses for the teacher
 
     def test_perform_create_teacher_assignment(self):
-        url = reverse("course-list")
+        url = COURSE_LIST
         self.client.force_authenticate(user=self.user1)
         response = self.client.post(
             url,
@@ -142,30 +198,97 @@ class CourseViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
     def test_search_filter(self):
-        url = reverse("course-list")
+        url = COURSE_LIST
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(url + "?search=Course 1")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Ensure only one course matches the search query
         matching_courses = [
-            course for course in response.data if "Course 1" in course["title"]
+            course
+            for course in response.data["results"]
+            if "Course 1" in course["title"]
         ]
         self.assertEqual(len(matching_courses), 1)
         self.assertEqual(matching_courses[0]["title"], "Course 1")
 
     def test_ordering_filter(self):
-        url = reverse("course-list")
+        url = COURSE_LIST
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(url + "?ordering=-price")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Ensure the courses are ordered by price in descending order
-        prices = [course["price"] for course in response.data]
+        prices = [course["price"] for course in response.data["results"]]
         self.assertEqual(prices, ["200.00", "100.00"])
 
+    def test_owner_can_update_course(self):
+        url = COURSE_DETAIL.format(pk=self.course1.id)
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.patch(url, {"title": "Course 1 (updated)"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.course1.refresh_from_db()
+        self.assertEqual(self.course1.title, "Course 1 (updated)")
+
     def test_update_nonexistent_course(self):
-        url = reverse("course-detail", kwargs={"pk": 9999})
+        url = COURSE_DETAIL.format(pk=9999)
         self.client.force_authenticate(user=self.user1)
         response = self.client.put(url, {"title": "Nonexistent Course"})
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CourseEnrollmentViewSetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        teacher_user = User.objects.create_user(
+            username="teacher1", password="password123", user_type="teacher"
+        )
+        course = Course.objects.create(
+            title="Course 1",
+            description="Description 1",
+            price=100,
+            teacher=Teacher.objects.create(user=teacher_user),
+            is_published=True,
+        )
+        cls.student_user = User.objects.create_user(
+            username="student", password="password123", user_type="student"
+        )
+        cls.other_student_user = User.objects.create_user(
+            username="student2", password="password123", user_type="student"
+        )
+        Student.objects.create(
+            user=cls.other_student_user,
+            phone="01012345670",
+            parent_phone="01098765430",
+        )
+        cls.enrollment = Enrollment.objects.create(
+            student=Student.objects.create(
+                user=cls.student_user,
+                phone="01012345678",
+                parent_phone="01098765432",
+            ),
+            course=course,
+            status=Enrollment.STATUS_ACTIVE,
+            original_price=100,
+            payment_method=Enrollment.PAYMENT_CREDIT_CARD,
+        )
+
+    def test_destroy_cancels_own_enrollment_once(self):
+        url = reverse("enrollments-detail", kwargs={"pk": self.enrollment.pk})
+        course = Course.objects.get(pk=self.enrollment.course_id)
+        self.assertEqual(course.enrollment_count, 1)
+
+        self.client.force_authenticate(user=self.other_student_user)
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=self.student_user)
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.status, Enrollment.STATUS_CANCELLED)
+        course = Course.objects.get(pk=self.enrollment.course_id)
+        self.assertEqual(course.enrollment_count, 0)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
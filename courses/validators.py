@@ -1,12 +1,15 @@
-import os
-import uuid
-from PIL import Image
+import re
+import secrets
+import struct
+from functools import lru_cache
+from PIL import ImageFile
 from decimal import Decimal
 from django.conf import settings
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from users.validators import BYTES_PER_MB
 
 # =====================
 # CONFIGURATION CONSTANTS
@@ -14,11 +17,19 @@ from django.utils import timezone
 
 # Image upload settings
 MAX_IMAGE_SIZE_MB = getattr(settings, "MAX_COURSE_IMAGE_SIZE_MB", 2)
+MAX_IMAGE_SIZE_BYTES = MAX_IMAGE_SIZE_MB * BYTES_PER_MB
 MIN_IMAGE_WIDTH = 200
 MIN_IMAGE_HEIGHT = 200
 MAX_IMAGE_WIDTH = 4000
 MAX_IMAGE_HEIGHT = 4000
 ALLOWED_IMAGE_EXTENSIONS = ["jpg", "jpeg", "png", "webp"]
+# Set form for per-upload membership checks; the list keeps message order
+ALLOWED_IMAGE_EXTENSION_SET = frozenset(ALLOWED_IMAGE_EXTENSIONS)
+# Pillow format names matching ALLOWED_IMAGE_EXTENSIONS
+ALLOWED_IMAGE_FORMATS = frozenset({"JPEG", "PNG", "WEBP"})
+# Bytes fed to the header parser per step
+IMAGE_PROBE_CHUNK_SIZE = 8192
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 # Course pricing
 MIN_COURSE_PRICE = Decimal("5.00")
 MAX_COURSE_PRICE = Decimal("999999.99")
@@ -26,6 +37,11 @@ MAX_COURSE_PRICE = Decimal("999999.99")
 MIN_RATING = Decimal("1.0")
 MAX_RATING = Decimal("5.0")
 
+# Upload filenames keep this many characters of the slugified name
+UPLOAD_SLUG_LENGTH = 50
+# Strips everything but lowercase letters and digits from extensions
+_EXTENSION_STRIP = re.compile(r"[^a-z0-9]").sub
+
 # ==================
 # CUSTOM VALIDATORS
 # ==================
@@ -44,10 +60,9 @@ def validate_image_size(value):
     if not value:
         return
 
-    max_size_bytes = MAX_IMAGE_SIZE_MB * 1024 * 1024
     filesize = value.size
 
-    if filesize > max_size_bytes:
+    if filesize > MAX_IMAGE_SIZE_BYTES:
         raise ValidationError(
             _(
                 "Image size cannot exceed %(max_size)sMB. "
@@ -55,20 +70,58 @@ def validate_image_size(value):
             ),
             params={
                 "max_size": MAX_IMAGE_SIZE_MB,
-                "current_size": filesize / (1024 * 1024),
+                "current_size": filesize / BYTES_PER_MB,
             },
             code="image_too_large",
         )
 
 
+def probe_image_header(value):
+    """
+    Read an image's format and size from its header.
+
+    PNG keeps its dimensions at a fixed offset in the IHDR chunk, so they
+    are unpacked from the first 24 bytes. Other formats are fed to Pillow's
+    incremental parser chunk by chunk until it knows the size.
+
+    Args:
+        value: Django UploadedFile object
+
+    Returns:
+        tuple: ``(format, width, height)``, or None if unrecognised
+    """
+    value.seek(0)
+    head = value.read(24)
+    value.seek(0)
+    if head[:8] == PNG_SIGNATURE and head[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", head[16:24])
+        return "PNG", width, height
+
+    parser = ImageFile.Parser()
+    for chunk in value.chunks(IMAGE_PROBE_CHUNK_SIZE):
+        parser.feed(chunk)
+        if parser.image:
+            break
+    value.seek(0)
+
+    img = parser.image
+    if img is None:
+        return None
+    return (img.format, *img.size)
+
+
 def validate_image_dimensions(value):
     """
-    Validate image dimensions.
+    Validate image format and dimensions.
 
     Requirements:
+    - Format: JPEG, PNG or WebP, sniffed from the content
     - Minimum: 200x200px (ensures quality)
     - Maximum: 4000x4000px (prevents abuse)
 
+    Only the header is read (see ``probe_image_header``), so the upload is
+    never fully read or decoded here.
+
     Args:
         value: Django UploadedFile object
 
@@ -79,9 +132,12 @@ def validate_image_dimensions(value):
         return
 
     try:
-        # Open image and get dimensions
-        img = Image.open(value)
-        width, height = img.size
+        probe = probe_image_header(value)
+        if probe is None or probe[0] not in ALLOWED_IMAGE_FORMATS:
+            raise ValidationError(
+                _("Unsupported image format."), code="invalid_image_format"
+            )
+        _format, width, height = probe
 
         # Validate minimum dimensions
         if width < MIN_IMAGE_WIDTH or height < MIN_IMAGE_HEIGHT:
@@ -114,8 +170,6 @@ def validate_image_dimensions(value):
                 code="image_too_large",
             )
 
-        value.seek(0)
-
     except Exception as e:
         raise ValidationError(
             _("Invalid image file: %(error)s"),
@@ -124,20 +178,46 @@ def validate_image_dimensions(value):
         )
 
 
+def validate_course_image(value):
+    """
+    Validate an uploaded image's size and dimensions in one validator.
+
+    The size check only reads ``value.size``, so it runs first; the
+    header probe is then the only pass over the file.
+
+    Args:
+        value: Django UploadedFile object
+
+    Raises:
+        ValidationError: If the image is too large or badly sized
+    """
+    if not value:
+        return
+
+    validate_image_size(value)
+    validate_image_dimensions(value)
+
+
 # =====================
 # UPLOAD PATH FUNCTIONS
 # =====================
 
 
+@lru_cache(maxsize=4096)
+def _upload_slug(name):
+    """Slugify ``name`` for upload filenames (memoized, slugify is regex-heavy)"""
+    return slugify(name)[:UPLOAD_SLUG_LENGTH]
+
+
 def education_flag_path(instance, filename):
     """
     Generate secure upload path for education country flags.
 
-    Path: education/flags/{country_slug}-{uuid}.{ext}
+    Path: education/flags/{country_slug}-{hex8}.{ext}
     Example: education/flags/egypt-a1b2c3d4.png
 
     Security improvements:
-    - Added UUID to prevent collisions
+    - Added random hex suffix to prevent collisions
     - Sanitized extension
     - Validated extension exists
 
@@ -157,33 +237,34 @@ def education_flag_path(instance, filename):
     ext = filename.split(".")[-1].lower()
 
     # Security: Sanitize extension
-    ext = "".join(c for c in ext if c.isalnum())
+    ext = _EXTENSION_STRIP("", ext)
 
-    if ext not in ALLOWED_IMAGE_EXTENSIONS:
+    if ext not in ALLOWED_IMAGE_EXTENSION_SET:
         raise ValidationError(
             _("Invalid file extension: %(ext)s. Allowed: %(allowed)s"),
             params={"ext": ext, "allowed": ", ".join(ALLOWED_IMAGE_EXTENSIONS)},
             code="invalid_extension",
         )
 
-    # Create safe filename with UUID to prevent collisions
-    safe_name = slugify(instance.country)[:50]
-    unique_id = str(uuid.uuid4())[:8]
+    # Create safe filename with a random suffix to prevent collisions
+    safe_name = _upload_slug(instance.country)
+    unique_id = secrets.token_hex(4)
     new_filename = f"{safe_name}-{unique_id}.{ext}"
 
-    return os.path.join("education", "flags", new_filename)
+    # Storage paths are always posix-style, whatever the host OS
+    return f"education/flags/{new_filename}"
 
 
 def course_image_path(instance, filename):
     """
     Generate secure upload path for course thumbnails.
 
-    Path: courses/thumbnails/{year}/{month}/{course-slug}-{uuid}.{ext}
+    Path: courses/thumbnails/{year}/{month}/{course-slug}-{hex8}.{ext}
     Example: courses/thumbnails/2025/02/intro-python-a1b2c3d4.jpg
 
     Benefits:
     - Organized by date for easier management
-    - UUID prevents filename collisions
+    - Random hex suffix prevents filename collisions
     - Supports multiple image versions
 
     Args:
@@ -202,9 +283,9 @@ def course_image_path(instance, filename):
     ext = filename.split(".")[-1].lower()
 
     # Security: Sanitize extension
-    ext = "".join(c for c in ext if c.isalnum())
+    ext = _EXTENSION_STRIP("", ext)
 
-    if ext not in ALLOWED_IMAGE_EXTENSIONS:
+    if ext not in ALLOWED_IMAGE_EXTENSION_SET:
         raise ValidationError(
             _("Invalid file extension: %(ext)s. Allowed: %(allowed)s"),
             params={"ext": ext, "allowed": ", ".join(ALLOWED_IMAGE_EXTENSIONS)},
@@ -212,8 +293,8 @@ def course_image_path(instance, filename):
         )
 
     # Create safe filename
-    safe_title = slugify(instance.title)[:50]
-    unique_id = str(uuid.uuid4())[:8]
+    safe_title = _upload_slug(instance.title)
+    unique_id = secrets.token_hex(4)
     new_filename = f"{safe_title}-{unique_id}.{ext}"
 
     # Use current date for organization
@@ -221,7 +302,7 @@ def course_image_path(instance, filename):
     year = now.year
     month = str(now.month).zfill(2)  # Zero-padded month
 
-    return os.path.join("courses", "thumbnails", str(year), month, new_filename)
+    return f"courses/thumbnails/{year}/{month}/{new_filename}"
 
 
 def validate_video_duration(value):
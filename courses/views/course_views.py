@@ -2,6 +2,8 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 # from django.utils.translation import gettext_lazy as _
 from ..models.course_models import Course
+from ..pagination import CoursePagination
+from .utils import cache_per_request
 from ..Serializers.course_serializers import (
     CourseCreateUpdateSerializer,
     CourseDetailSerializer,
@@ -15,6 +17,7 @@ from users.permissions import (
 
 class CourseViewSet(viewsets.ModelViewSet):
     permission_classes = [IsTeacherOrReadOnly, IsTeacherOwnerOrReadOnly]
+    pagination_class = CoursePagination
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -25,11 +28,20 @@ class CourseViewSet(viewsets.ModelViewSet):
             return CourseCreateUpdateSerializer
         return CourseDetailSerializer
 
+    @cache_per_request
     def get_queryset(self):
         user = self.request.user
-        queryset = Course.objects.select_related(
-            "education", "teacher", "subject", "teacher__user"
-        )
+        if self.action == "list":
+            queryset = CourseListSerializer.prefetch_queryset(Course.objects.all())
+        elif self.action == "retrieve":
+            # Explicit ordering: Meta.ordering is dropped from GROUP BY queries.
+            queryset = CourseDetailSerializer.prefetch_queryset(
+                Course.objects.order_by("-created_at")
+            )
+        else:
+            # Writes only need the owner check (obj.teacher.user_id), not the
+            # detail joins and aggregates.
+            queryset = Course.objects.select_related("teacher")
 
         if self.action in ["list", "retrieve"]:
             if user.is_authenticated and user.user_type == "teacher":
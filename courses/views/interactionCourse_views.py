@@ -1,4 +1,5 @@
 from rest_framework import viewsets, status
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from users.permissions import (
     IsStudent,
@@ -14,6 +15,7 @@ from ..Serializers.interactionCourse_serializers import (
     CourseReviewCreateSerializer,
     CourseReviewSerializer,
 )
+from .utils import cache_per_request
 
 
 class CourseEnrollmentViewSet(viewsets.ModelViewSet):
@@ -36,12 +38,23 @@ class CourseEnrollmentViewSet(viewsets.ModelViewSet):
         else:
             return CourseEnrollmentListSerializer
 
+    @cache_per_request
     def get_queryset(self):
         user = self.request.user
-        queryset = Enrollment.objects.select_related(
-            "course", "course__teacher", "student__user"
-        ).filter(status__in=[Enrollment.STATUS_ACTIVE, Enrollment.STATUS_COMPLETED])
-        if user.is_staff or user.is_superuser:
+        if self.action == "list":
+            queryset = CourseEnrollmentListSerializer.prefetch_queryset(
+                Enrollment.objects.all()
+            )
+        elif self.action == "destroy":
+            # destroy() cancels by pk with an UPDATE; no row is rendered
+            queryset = Enrollment.objects.all()
+        else:
+            # IsEnrollmentOwner reads obj.student and obj.course.teacher
+            queryset = CourseEnrollmentDetailSerializer.prefetch_queryset(
+                Enrollment.objects.select_related("student", "course__teacher")
+            )
+        queryset = queryset.filter(status__in=Enrollment.ENROLLED_STATUSES)
+        if user.is_admin:
             return queryset
         elif user.user_type == "student":
             return queryset.filter(student__user=user)
@@ -53,16 +66,19 @@ class CourseEnrollmentViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         """
         Instead of deleting the enrollment, we will mark it as cancelled (soft delete).
-        """
-        instance = self.get_object()
 
-        if instance.status in [Enrollment.STATUS_CANCELLED, Enrollment.STATUS_REFUNDED]:
-            return Response(
-                {"detail": "enrollment is already cancelled or refunded"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        instance.cancel(reason="User requested cancellation")
+        get_queryset() already limits rows to the requester's own live
+        enrollments (or those of their courses), the same rule
+        IsEnrollmentOwner applies per object, so the cancel runs as one
+        guarded UPDATE without loading the enrollment first. Unknown,
+        foreign and already closed enrollments all match no row.
+        """
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        enrollments = self.get_queryset().filter(pk=self.kwargs[lookup])
+        if not Enrollment.bulk_cancel(
+            enrollments, reason="User requested cancellation"
+        ):
+            raise NotFound()
 
         return Response(
             {"detail": "enrollment has been successfully cancelled"},
@@ -78,11 +94,17 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
             return CourseReviewCreateSerializer
         return CourseReviewSerializer
 
+    @cache_per_request
     def get_queryset(self):
         user = self.request.user
-        queryset = Review.objects.select_related("student__user", "course")
+        if self.action in ["list", "retrieve"]:
+            queryset = CourseReviewSerializer.prefetch_queryset(Review.objects.all())
+        else:
+            # Writes render from the saved attributes; IsStudentOrAdmin only
+            # reads obj.student.user_id
+            queryset = Review.objects.select_related("student")
 
-        if user.is_staff or user.is_superuser:
+        if user.is_admin:
             return queryset
 
         if hasattr(user, "user_type") and user.user_type == "student":
@@ -0,0 +1,21 @@
+from functools import wraps
+
+
+def cache_per_request(get_queryset):
+    """
+    Memoize a viewset's ``get_queryset`` on the view instance.
+
+    DRF builds a new view instance for every request, so the cached
+    queryset can never leak between requests or users. Callers only
+    filter or clone it, which leaves the cached base untouched.
+    """
+
+    @wraps(get_queryset)
+    def wrapper(self):
+        try:
+            return self._cached_queryset
+        except AttributeError:
+            self._cached_queryset = get_queryset(self)
+            return self._cached_queryset
+
+    return wrapper
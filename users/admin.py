@@ -1,9 +1,12 @@
+from django.conf import settings
 from django.contrib import admin
 from .models import Teacher, Student
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
-admin.site.register(Teacher)
-admin.site.register(Student)
-admin.site.register(User)
+# API-only deployments skip building the default ModelAdmin classes
+if getattr(settings, "ENABLE_DJANGO_ADMIN", True):
+    admin.site.register(Teacher)
+    admin.site.register(Student)
+    admin.site.register(User)
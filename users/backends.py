@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the user's teacher/student profile with the user.
+
+    Views and serializers read ``request.user.teacher_profile`` /
+    ``student_profile`` on most requests; joining both OneToOnes into the
+    session user lookup makes those plain attribute reads.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related(
+                "teacher_profile", "student_profile"
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,25 @@
+from django.contrib.auth import BACKEND_SESSION_KEY
+
+# Backend path stored in sessions created before ProfileModelBackend
+LEGACY_SESSION_BACKEND = "django.contrib.auth.backends.ModelBackend"
+SESSION_BACKEND = "users.backends.ProfileModelBackend"
+
+
+class LegacySessionBackendMiddleware:
+    """
+    Move sessions logged in through ModelBackend onto ProfileModelBackend.
+
+    Django drops a session whose stored backend is no longer configured, so
+    this rewrites the old path once, on the session's first request after
+    the switch. Must sit between SessionMiddleware and
+    AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        session = request.session
+        if session.get(BACKEND_SESSION_KEY) == LEGACY_SESSION_BACKEND:
+            session[BACKEND_SESSION_KEY] = SESSION_BACKEND
+        return self.get_response(request)
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_alter_student_parent_phone_alter_student_phone"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="student",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("phone", models.F("parent_phone")), _negated=True),
+                name="student_parent_phone_distinct",
+            ),
+        ),
+    ]
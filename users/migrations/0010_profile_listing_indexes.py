@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0021_enrollment_live_indexes"),
+        ("users", "0009_student_parent_phone_distinct"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="student",
+            name="users_stude_academi_6ab170_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="student",
+            name="users_stude_user_id_e799ac_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="teacher",
+            name="users_teach_is_veri_9f87a7_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="teacher",
+            name="users_teach_subject_9ac92a_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="teacher",
+            name="users_teach_user_id_776c06_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="teacher",
+            name="users_teach_is_acti_e5b6bc_idx",
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["academic_year", "-created_at"], name="student_listing_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="teacher",
+            index=models.Index(
+                fields=["is_active", "is_verified", "subject", "-created_at"],
+                name="teacher_listing_idx",
+            ),
+        ),
+    ]
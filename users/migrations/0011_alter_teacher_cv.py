@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:52
+
+import users.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0010_profile_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="teacher",
+            name="cv",
+            field=models.FileField(
+                blank=True,
+                help_text="Upload CV in PDF format (max 5MB)",
+                null=True,
+                upload_to=users.validators.cv_upload_path,
+                validators=[users.validators.validate_cv],
+            ),
+        ),
+    ]
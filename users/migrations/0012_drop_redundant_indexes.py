@@ -0,0 +1,28 @@
+# Generated by Django 6.0.2 on 2026-10-14 13:54
+
+import users.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0011_alter_teacher_cv"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="student",
+            name="academic_year",
+            field=models.PositiveSmallIntegerField(
+                default=1,
+                help_text="Current academic year/grade (1-12)",
+                validators=[users.validators.validate_academic_year],
+            ),
+        ),
+        migrations.AlterField(
+            model_name="teacher",
+            name="is_active",
+            field=models.BooleanField(default=True, help_text="Active profile status"),
+        ),
+    ]
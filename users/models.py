@@ -1,8 +1,8 @@
+from bisect import bisect_right
 from typing import Optional
 from django.core.validators import (
     MinValueValidator,
     MaxValueValidator,
-    FileExtensionValidator,
 )
 from .validators import (
     ALLOWED_CV_EXTENSIONS as ALLOWED_CV_EXTENSIONS,
@@ -13,9 +13,11 @@ from .validators import (
     MIN_EXPERIENCE_YEARS as MIN_EXPERIENCE_YEARS,
     ValidationError as ValidationError,
     cv_upload_path as cv_upload_path,
+    normalize_phone as normalize_phone,
     re as re,
     settings as settings,
     validate_academic_year as validate_academic_year,
+    validate_cv as validate_cv,
     validate_file_size as validate_file_size,
     validate_pdf as validate_pdf,
     validate_phone as validate_phone,
@@ -23,10 +25,71 @@ from .validators import (
     )
 
 from decimal import Decimal
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef
 from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
+from .utils import count_subquery
+
+# Formatting ignored when comparing student and parent phone numbers
+_PHONE_COMPARE_STRIP = re.compile(r"[\s\-\(\)\.]").sub
+
+# Shared validator instances for the profile fields below
+_MIN_EXPERIENCE = MinValueValidator(MIN_EXPERIENCE_YEARS)
+_MAX_EXPERIENCE = MaxValueValidator(MAX_EXPERIENCE_YEARS)
+_NON_NEGATIVE_RATE = MinValueValidator(Decimal("0.00"))
+
+# Display labels, built once at import instead of on every property access
+_ORDINAL_SUFFIXES = {1: "st", 2: "nd", 3: "rd"}
+_GRADE_LABELS = {
+    year: _(f"{year}{_ORDINAL_SUFFIXES.get(year, 'th')} Grade")
+    for year in range(MIN_ACADEMIC_YEAR, MAX_ACADEMIC_YEAR + 1)
+}
+# Teacher.experience_level: lower bound (years) of each label after the first
+_EXPERIENCE_THRESHOLDS = (1, 3, 7, 15)
+_EXPERIENCE_LABELS = ("Entry Level", "Junior", "Mid-Level", "Senior", "Expert")
+# Shared by the is_experienced/is_senior properties and their queryset filters
+_EXPERIENCED_YEARS = 5
+_SENIOR_ACADEMIC_YEAR = 10
+# User columns rendered in the teacher and student list payloads
+_LIST_USER_FIELDS = (
+    "user__username",
+    "user__first_name",
+    "user__last_name",
+    "user__user_type",
+)
+
+
+def _guarded_update(instance, guard=None, **changes):
+    """
+    Write ``changes`` to ``instance``'s row if it still matches ``guard``.
+
+    One UPDATE instead of save(): no full_clean() or signals, and a
+    concurrent change that already moved the row off ``guard`` makes this a
+    no-op. On success the changes are mirrored onto the instance and, for a
+    profile, the parent user is touched, as save() does.
+
+    Returns:
+        bool: True if the row was updated
+    """
+    changes.setdefault("updated_at", timezone.now())
+    updated = (
+        type(instance)
+        .objects.filter(pk=instance.pk, **(guard or {}))
+        .update(**changes)
+    )
+    if not updated:
+        return False
+
+    for field, value in changes.items():
+        setattr(instance, field, value)
+    if not isinstance(instance, User):
+        User.objects.filter(pk=instance.user_id).update(
+            updated_at=changes["updated_at"]
+        )
+    return True
+
 
 # =====================
 # USER MODEL
@@ -92,6 +155,11 @@ class User(AbstractUser):
         """
         return f"{self.first_name} {self.last_name}".strip()
 
+    @property
+    def is_admin(self):
+        """Staff or superuser; the bypass check shared by views and permissions."""
+        return self.is_staff or self.is_superuser
+
     def soft_delete(self):
         """
         Soft delete user (set is_active=False, preserve data).
@@ -102,16 +170,12 @@ class User(AbstractUser):
         - Support audit requirements
         - Allow re-activation
         """
-
-        self.active = False
-        self.deleted_at = timezone.now()
-        self.save(update_fields=["active", "deleted_at", "updated_at"])
+        now = timezone.now()
+        _guarded_update(self, is_active=False, deleted_at=now, updated_at=now)
 
     def restore(self):
         """Restore soft-deleted user"""
-        self.active = True
-        self.deleted_at = None
-        self.save(update_fields=["active", "deleted_at", "updated_at"])
+        _guarded_update(self, is_active=True, deleted_at=None)
 
 
 # =====================
@@ -119,6 +183,24 @@ class User(AbstractUser):
 # =====================
 
 
+class TeacherQuerySet(models.QuerySet):
+    def with_user(self):
+        """Join the user row every teacher serializer renders."""
+        return self.select_related("user")
+
+    def for_list(self):
+        """Load only the columns the teacher list renders (no bio, no cv)."""
+        return self.with_user().only("id", "user", *_LIST_USER_FIELDS)
+
+    def verified(self):
+        """Active, verified teachers; served by ``teacher_listing_idx``."""
+        return self.filter(is_active=True, is_verified=True)
+
+    def experienced(self):
+        """Queryset form of Teacher.is_experienced."""
+        return self.filter(experience_years__gte=_EXPERIENCED_YEARS)
+
+
 class Teacher(models.Model):
     """
     Teacher profile model containing additional information for teachers.
@@ -154,10 +236,7 @@ class Teacher(models.Model):
 
     experience_years = models.PositiveSmallIntegerField(
         default=1,
-        validators=[
-            MinValueValidator(MIN_EXPERIENCE_YEARS),
-            MaxValueValidator(MAX_EXPERIENCE_YEARS),
-        ],
+        validators=[_MIN_EXPERIENCE, _MAX_EXPERIENCE],
         help_text=_(
             f"Years of teaching experience ({MIN_EXPERIENCE_YEARS}-{MAX_EXPERIENCE_YEARS})"
         ),
@@ -165,11 +244,7 @@ class Teacher(models.Model):
 
     cv = models.FileField(
         upload_to=cv_upload_path,
-        validators=[
-            FileExtensionValidator(allowed_extensions=ALLOWED_CV_EXTENSIONS),
-            validate_file_size,
-            validate_pdf,
-        ],
+        validators=[validate_cv],
         blank=True,  # Made optional for initial profile creation
         null=True,
         help_text=_(f"Upload CV in PDF format (max {MAX_CV_FILE_SIZE_MB}MB)"),
@@ -200,26 +275,30 @@ class Teacher(models.Model):
         decimal_places=2,
         null=True,
         blank=True,
-        validators=[MinValueValidator(Decimal("0.00"))],
+        validators=[_NON_NEGATIVE_RATE],
         help_text=_("Hourly teaching rate in local currency (optional)"),
     )
 
-    is_active = models.BooleanField(
-        default=True, db_index=True, help_text=_("Active profile status")
-    )
+    is_active = models.BooleanField(default=True, help_text=_("Active profile status"))
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TeacherQuerySet.as_manager()
+
+    # Fields with validators or clean() rules; see save()
+    VALIDATED_FIELDS = frozenset({"user", "experience_years", "cv", "hourly_rate"})
+
     class Meta:
         verbose_name = _("Teacher Profile")
         verbose_name_plural = _("Teacher Profiles")
         ordering = ["-created_at"]
+        # user is already covered by its one-to-one unique index
         indexes = [
-            models.Index(fields=["is_verified", "-created_at"]),
-            models.Index(fields=["subject"]),
-            models.Index(fields=["user", "is_verified"]),
-            models.Index(fields=["is_active", "is_verified"]),
+            models.Index(
+                fields=["is_active", "is_verified", "subject", "-created_at"],
+                name="teacher_listing_idx",
+            ),
         ]
 
     def __str__(self):
@@ -239,8 +318,15 @@ class Teacher(models.Model):
         if not self.user_id:
             return
 
+        # Only the type and active flag are checked; don't load the full row
+        user = (
+            self.user
+            if Teacher.user.is_cached(self)
+            else User.objects.only("user_type", "is_active").get(pk=self.user_id)
+        )
+
         # Ensure linked user has Teacher user_type
-        if self.user.user_type != User.USER_TYPE_TEACHER:
+        if user.user_type != User.USER_TYPE_TEACHER:
             raise ValidationError(
                 {
                     "user": _(
@@ -250,7 +336,7 @@ class Teacher(models.Model):
             )
 
         # Ensure user is active
-        if not self.user.is_active:
+        if not user.is_active:
             raise ValidationError(
                 {"user": _("Cannot create profile for inactive user.")}
             )
@@ -260,34 +346,35 @@ class Teacher(models.Model):
         Override save to run validation and update user's updated_at.
 
         Note: Use skip_validation=True to bypass validation when needed
-        (e.g., during data migrations)
+        (e.g., during data migrations). Partial saves whose update_fields
+        avoid VALIDATED_FIELDS skip validation too.
         """
-        if not kwargs.pop("skip_validation", False):
+        skip_validation = kwargs.pop("skip_validation", False)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.VALIDATED_FIELDS.isdisjoint(
+            update_fields
+        ):
+            skip_validation = True
+        if not skip_validation:
             self.full_clean()
 
         super().save(*args, **kwargs)
 
         # Update parent user's timestamp for cache invalidation
-        self.user.save(update_fields=["updated_at"])
+        # (one UPDATE; no User load or save() round-trip)
+        User.objects.filter(pk=self.user_id).update(updated_at=timezone.now())
 
     @property
     def is_experienced(self):
         """Check if teacher has significant experience (5+ years)"""
-        return self.experience_years >= 5
+        return self.experience_years >= _EXPERIENCED_YEARS
 
     @property
     def experience_level(self):
         """Return human-readable experience level"""
-        if self.experience_years == 0:
-            return "Entry Level"
-        elif self.experience_years < 3:
-            return "Junior"
-        elif self.experience_years < 7:
-            return "Mid-Level"
-        elif self.experience_years < 15:
-            return "Senior"
-        else:
-            return "Expert"
+        return _EXPERIENCE_LABELS[
+            bisect_right(_EXPERIENCE_THRESHOLDS, self.experience_years)
+        ]
 
     @property
     def active_courses(self):
@@ -295,8 +382,21 @@ class Teacher(models.Model):
 
     @property
     def courses_count(self):
+        """Active courses (``_courses_count`` annotation, see with_counts())"""
+        if "_courses_count" in self.__dict__:
+            return self._courses_count
         return self.active_courses.count()
 
+    @classmethod
+    def with_counts(cls, queryset=None):
+        """Annotate ``courses_count`` for every teacher in one query."""
+        if queryset is None:
+            queryset = cls.objects.all()
+        courses = cls.teacher_courses.rel.related_model.objects.filter(
+            teacher=OuterRef("pk"), is_active=True
+        )
+        return queryset.annotate(_courses_count=count_subquery(courses, "teacher"))
+
     def verify_teacher(self, verified_by_user):
         """
         Mark teacher as verified (admin action).
@@ -311,16 +411,14 @@ class Teacher(models.Model):
         if self.is_verified:
             return False  # Already verified
 
-        self.is_verified = True
-        self.verified_by = verified_by_user
-        self.verified_at = timezone.now()
-
-        self.save(
-            update_fields=["is_verified", "verified_by", "verified_at", "updated_at"]
+        return _guarded_update(
+            self,
+            {"is_verified": False},
+            is_verified=True,
+            verified_by=verified_by_user,
+            verified_at=timezone.now(),
         )
 
-        return True
-
     def unverify_teacher(self):
         """
         Remove verification status.
@@ -334,10 +432,7 @@ class Teacher(models.Model):
         if not self.is_verified:
             return False  # Not verified
 
-        self.is_verified = False
-        self.save(update_fields=["is_verified", "updated_at"])
-
-        return True
+        return _guarded_update(self, {"is_verified": True}, is_verified=False)
 
 
 # =====================
@@ -345,6 +440,20 @@ class Teacher(models.Model):
 # =====================
 
 
+class StudentQuerySet(models.QuerySet):
+    def with_user(self):
+        """Join the user row every student serializer renders."""
+        return self.select_related("user")
+
+    def for_list(self):
+        """Load only the columns the student list renders (no bio, no phones)."""
+        return self.with_user().only("id", "academic_year", "user", *_LIST_USER_FIELDS)
+
+    def seniors(self):
+        """Queryset form of Student.is_senior; a range on student_listing_idx."""
+        return self.filter(academic_year__gte=_SENIOR_ACADEMIC_YEAR)
+
+
 class Student(models.Model):
     """
     Student profile model containing additional information for students.
@@ -365,7 +474,6 @@ class Student(models.Model):
     academic_year = models.PositiveSmallIntegerField(
         default=1,
         validators=[validate_academic_year],
-        db_index=True,
         help_text=_(
             f"Current academic year/grade ({MIN_ACADEMIC_YEAR}-{MAX_ACADEMIC_YEAR})"
         ),
@@ -390,13 +498,27 @@ class Student(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = StudentQuerySet.as_manager()
+
+    # Fields with validators or clean() rules; see save()
+    VALIDATED_FIELDS = frozenset({"user", "academic_year", "phone", "parent_phone"})
+
     class Meta:
         verbose_name = _("Student Profile")
         verbose_name_plural = _("Student Profiles")
         ordering = ["academic_year", "-created_at"]
         indexes = [
-            models.Index(fields=["academic_year"]),
-            models.Index(fields=["user", "academic_year"]),
+            models.Index(
+                fields=["academic_year", "-created_at"], name="student_listing_idx"
+            ),
+        ]
+        constraints = [
+            # Catches exact duplicates from bulk paths that skip clean();
+            # clean() also rejects numbers differing only in formatting
+            models.CheckConstraint(
+                condition=~models.Q(phone=models.F("parent_phone")),
+                name="student_parent_phone_distinct",
+            ),
         ]
 
     def __str__(self):
@@ -416,8 +538,15 @@ class Student(models.Model):
         if not self.user_id:
             return
 
+        # Only the type and active flag are checked; don't load the full row
+        user = (
+            self.user
+            if Student.user.is_cached(self)
+            else User.objects.only("user_type", "is_active").get(pk=self.user_id)
+        )
+
         # Ensure linked user has Student user_type
-        if self.user.user_type != User.USER_TYPE_STUDENT:
+        if user.user_type != User.USER_TYPE_STUDENT:
             raise ValidationError(
                 {
                     "user": _(
@@ -427,18 +556,21 @@ class Student(models.Model):
             )
 
         # Ensure user is active
-        if not self.user.is_active:
+        if not user.is_active:
             raise ValidationError(
                 {"user": _("Cannot create profile for inactive user.")}
             )
 
         # Ensure parent phone is different from student phone
         if self.phone and self.parent_phone:
-            # Clean both for comparison
-            cleaned_student = re.sub(r"[\s\-\(\)\.]", "", str(self.phone))
-            cleaned_parent = re.sub(r"[\s\-\(\)\.]", "", str(self.parent_phone))
+            phone, parent_phone = str(self.phone), str(self.parent_phone)
+            # Identical raw strings need no normalizing before comparing
+            same_phone = phone == parent_phone or (
+                _PHONE_COMPARE_STRIP("", phone)
+                == _PHONE_COMPARE_STRIP("", parent_phone)
+            )
 
-            if cleaned_student == cleaned_parent:
+            if same_phone:
                 raise ValidationError(
                     {
                         "parent_phone": _(
@@ -451,15 +583,31 @@ class Student(models.Model):
         """
         Override save to run validation and update user's updated_at.
 
-        Note: Use skip_validation=True to bypass validation when needed
+        Phone numbers are stored normalized (formatting stripped), so equal
+        numbers compare equal in the database.
+
+        Note: Use skip_validation=True to bypass validation when needed.
+        Partial saves whose update_fields avoid VALIDATED_FIELDS skip
+        validation too.
         """
-        if not kwargs.pop("skip_validation", False):
+        if self.phone:
+            self.phone = normalize_phone(self.phone)
+        if self.parent_phone:
+            self.parent_phone = normalize_phone(self.parent_phone)
+
+        skip_validation = kwargs.pop("skip_validation", False)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.VALIDATED_FIELDS.isdisjoint(
+            update_fields
+        ):
+            skip_validation = True
+        if not skip_validation:
             self.full_clean()
 
         super().save(*args, **kwargs)
 
-        # Update parent user's timestamp
-        self.user.save(update_fields=["updated_at"])
+        # Update parent user's timestamp (one UPDATE, no User load)
+        User.objects.filter(pk=self.user_id).update(updated_at=timezone.now())
 
     @property
     def grade_level(self):
@@ -469,15 +617,11 @@ class Student(models.Model):
         Returns:
             str: Formatted grade level
         """
-        # Special handling for 1st, 2nd, 3rd
-        if self.academic_year == 1:
-            return _("1st Grade")
-        elif self.academic_year == 2:
-            return _("2nd Grade")
-        elif self.academic_year == 3:
-            return _("3rd Grade")
-        else:
-            return _(f"{self.academic_year}th Grade")
+        label = _GRADE_LABELS.get(self.academic_year)
+        if label is None:
+            # Out-of-range years (invalid, not yet cleaned rows)
+            label = _(f"{self.academic_year}th Grade")
+        return label
 
     def promote_to_next_year(self, promoted_by: Optional["User"] = None):
         """
@@ -498,18 +642,67 @@ class Student(models.Model):
         if self.academic_year >= MAX_ACADEMIC_YEAR:
             return False
 
-        self.academic_year += 1
-        self.save(update_fields=["academic_year", "updated_at"])
-        return True
+        return _guarded_update(
+            self,
+            {"academic_year": self.academic_year},
+            academic_year=self.academic_year + 1,
+        )
+
+    @classmethod
+    def bulk_promote(cls, queryset=None):
+        """
+        Promote every student in ``queryset`` below the final year at once.
+
+        Set-based counterpart of promote_to_next_year(): one UPDATE for the
+        profiles and one for their users' timestamps, however many rows
+        match. Bypasses full_clean(), which is safe because the filter keeps
+        the new year within range.
+
+        Returns:
+            int: Number of students promoted
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        promotable = queryset.filter(academic_year__lt=MAX_ACADEMIC_YEAR)
+        now = timezone.now()
+
+        with transaction.atomic():
+            # Touch users first; afterwards the filter would match other rows
+            User.objects.filter(pk__in=promotable.values("user_id")).update(
+                updated_at=now
+            )
+            return promotable.update(
+                academic_year=F("academic_year") + 1, updated_at=now
+            )
 
     @property
     def is_senior(self):
         """Check if student is in senior years (grades 10-12)"""
-        return self.academic_year >= 10
+        return self.academic_year >= _SENIOR_ACADEMIC_YEAR
 
     @property
     def enrolled_courses_count(self):
-        return self.enrollments.filter(course__is_active=True).count()
+        """Enrollments in active courses (annotation first, see with_counts())"""
+        if "_enrolled_courses_count" in self.__dict__:
+            return self._enrolled_courses_count
+        return self.my_enrollments.filter(course__is_active=True).count()
+
+    @classmethod
+    def with_counts(cls, queryset=None):
+        """
+        Annotate ``enrolled_courses_count`` for every student in one query.
+
+        A correlated subquery rather than a JOIN, so it isn't narrowed by
+        filters on the same relation (e.g. a teacher's own courses).
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        enrollments = cls.my_enrollments.rel.related_model.objects.filter(
+            student=OuterRef("pk"), course__is_active=True
+        )
+        return queryset.annotate(
+            _enrolled_courses_count=count_subquery(enrollments, "student")
+        )
 
 
 # =====================
@@ -524,8 +717,15 @@ class ActiveUserManager(models.Manager):
         return super().get_queryset().filter(user__is_active=True)
 
 
-class VerifiedTeacherManager(models.Manager):
+class VerifiedTeacherManager(models.Manager.from_queryset(TeacherQuerySet)):
     """Manager that returns only verified teachers"""
 
     def get_queryset(self):
-        return super().get_queryset().filter(is_verified=True, user__is_active=True)
+        # The user__is_active filter reuses the JOIN select_related adds;
+        # chain .for_list() to narrow the projection
+        return (
+            super()
+            .get_queryset()
+            .with_user()
+            .filter(is_verified=True, user__is_active=True)
+        )
@@ -1,5 +1,61 @@
 from rest_framework import permissions
 from courses.models.interactionCourse_models import Enrollment
+from users.models import User
+
+# Set form of SAFE_METHODS for the read-only short-circuits below
+_SAFE_METHODS = frozenset(permissions.SAFE_METHODS)
+# User types that carry a student or teacher profile
+_PROFILE_USER_TYPES = frozenset({"student", "teacher"})
+
+
+def _user_flags(request):
+    """
+    Return ``(is_authenticated, is_admin, user_type)`` for ``request.user``.
+
+    Computed once per request and shared by every permission class in the
+    stack; keyed on the user object so a re-authenticated request recomputes.
+    """
+    user = request.user
+    cached = getattr(request, "_user_flags_cache", None)
+    if cached is not None and cached[0] is user:
+        return cached[1]
+
+    flags = (
+        user.is_authenticated,
+        # AnonymousUser has no is_admin and is never an admin
+        getattr(user, "is_admin", False),
+        getattr(user, "user_type", None),
+    )
+    request._user_flags_cache = (user, flags)
+    return flags
+
+
+def _enrolled_course_ids(request):
+    """
+    Return the ids of courses ``request.user`` is enrolled in as a student.
+
+    Fetched once per request, not once per object check.
+    """
+    enrolled = getattr(request, "_enrolled_course_ids", None)
+    if enrolled is not None:
+        return enrolled
+
+    user, profile_cache = request.user, User.student_profile
+    if isinstance(user, User) and profile_cache.is_cached(user):
+        # Profile loaded with the session user (ProfileModelBackend): no
+        # profile means no enrollments; otherwise filter on student_id,
+        # which the (student, course) index answers without a JOIN
+        profile = profile_cache.related.get_cached_value(user)
+        if profile is None:
+            queryset = Enrollment.objects.none()
+        else:
+            queryset = Enrollment.objects.filter(student_id=profile.pk)
+    else:
+        queryset = Enrollment.objects.filter(student__user_id=user.id)
+
+    enrolled = frozenset(queryset.values_list("course_id", flat=True))
+    request._enrolled_course_ids = enrolled
+    return enrolled
 
 
 class IsTeacherOrReadOnly(permissions.BasePermission):
@@ -12,15 +68,12 @@ class IsTeacherOrReadOnly(permissions.BasePermission):
 
     def has_permission(self, request, view):
         # Allow read-only access for any request
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in _SAFE_METHODS:
             return True
 
         # Write permissions are only allowed to teachers
-        return request.user.is_authenticated and (
-            request.user.is_staff
-            or request.user.is_superuser
-            or request.user.user_type == "teacher"
-        )
+        authenticated, is_admin, user_type = _user_flags(request)
+        return authenticated and (is_admin or user_type == "teacher")
 
 
 class IsStudentOrReadOnly(permissions.BasePermission):
@@ -33,15 +86,12 @@ class IsStudentOrReadOnly(permissions.BasePermission):
 
     def has_permission(self, request, view):
         # Allow read-only access for any request
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in _SAFE_METHODS:
             return True
 
         # Write permissions are only allowed to students
-        return request.user.is_authenticated and (
-            request.user.is_staff
-            or request.user.is_superuser
-            or request.user.user_type == "student"
-        )
+        authenticated, is_admin, user_type = _user_flags(request)
+        return authenticated and (is_admin or user_type == "student")
 
 
 class IsTeacherOwnerOrReadOnly(permissions.BasePermission):
@@ -54,17 +104,14 @@ class IsTeacherOwnerOrReadOnly(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Allow read-only access for any request
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in _SAFE_METHODS:
             return True
 
         # Write permissions are only allowed to the teacher who owns the course
-        return request.user.is_authenticated and (
-            request.user.is_staff
-            or request.user.is_superuser
-            or (
-                request.user.user_type == "teacher"
-                and obj.teacher.user_id == request.user.id
-            )
+        authenticated, is_admin, user_type = _user_flags(request)
+        return authenticated and (
+            is_admin
+            or (user_type == "teacher" and obj.teacher.user_id == request.user.id)
         )
 
 
@@ -77,14 +124,17 @@ class IsStudentEnrolledOrReadOnly(permissions.BasePermission):
     message = "You can only access your own enrollments."
 
     def has_object_permission(self, request, view, obj):
+        # Allow read-only access for any request, before touching the user
+        if request.method in _SAFE_METHODS:
+            return True
+
+        _, is_admin, _ = _user_flags(request)
         # Allow staff or superuser to access all enrollments
-        if request.user.is_staff or request.user.is_superuser:
+        if is_admin:
             return True
 
         # Students can only access their own enrollments
-        return Enrollment.objects.filter(
-            student__user_id=request.user.id, course_id=obj.id
-        ).exists()
+        return obj.id in _enrolled_course_ids(request)
 
 
 class IsStudentOrTeacher(permissions.BasePermission):
@@ -95,11 +145,8 @@ class IsStudentOrTeacher(permissions.BasePermission):
     message = "You must be logged in as a student or teacher to access this resource."
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and (
-            request.user.is_staff
-            or request.user.is_superuser
-            or request.user.user_type in ["student", "teacher"]
-        )
+        authenticated, is_admin, user_type = _user_flags(request)
+        return authenticated and (is_admin or user_type in _PROFILE_USER_TYPES)
 
 
 class IsTeacher(permissions.BasePermission):
@@ -110,11 +157,8 @@ class IsTeacher(permissions.BasePermission):
     message = "You must be logged in as a teacher to access this resource."
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and (
-            request.user.is_staff
-            or request.user.is_superuser
-            or request.user.user_type == "teacher"
-        )
+        authenticated, is_admin, user_type = _user_flags(request)
+        return authenticated and (is_admin or user_type == "teacher")
 
 
 class IsStudent(permissions.BasePermission):
@@ -125,11 +169,8 @@ class IsStudent(permissions.BasePermission):
     message = "You must be logged in as a student to access this resource."
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and (
-            request.user.is_staff
-            or request.user.is_superuser
-            or request.user.user_type == "student"
-        )
+        authenticated, is_admin, user_type = _user_flags(request)
+        return authenticated and (is_admin or user_type == "student")
 
 
 class IsEnrollmentOwner(permissions.BasePermission):
@@ -140,16 +181,17 @@ class IsEnrollmentOwner(permissions.BasePermission):
     message = "You can only access your own enrollments."
 
     def has_object_permission(self, request, view, obj):
+        authenticated, is_admin, user_type = _user_flags(request)
         # Allow staff or superuser to access all enrollments
-        if request.user.is_staff or request.user.is_superuser:
+        if is_admin:
             return True
 
         # Students can only access their own enrollments
-        if request.user.is_authenticated and request.user.user_type == "student":
+        if authenticated and user_type == "student":
             return obj.student.user_id == request.user.id
 
         # Teachers can access enrollments for their courses
-        if request.user.is_authenticated and request.user.user_type == "teacher":
+        if authenticated and user_type == "teacher":
             return obj.course.teacher.user_id == request.user.id
 
         return False
@@ -164,17 +206,28 @@ class IsLessonCourseTeacherOrReadOnly(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Allow read-only access for any request
-        if request.method in permissions.SAFE_METHODS:
+        if request.method in _SAFE_METHODS:
             return True
 
         # Write permissions only for course teacher
-        return request.user.is_authenticated and (
-            request.user.is_staff
-            or request.user.is_superuser
-            or obj.course.teacher.user_id == request.user.id
+        authenticated, is_admin, _ = _user_flags(request)
+        return authenticated and (
+            is_admin or obj.course.teacher.user_id == request.user.id
         )
 
 
+class IsAnonymousOrAdmin(permissions.BasePermission):
+    """
+    Permission for sign-up endpoints: anonymous visitors and admins only.
+    """
+
+    message = "You are already signed in."
+
+    def has_permission(self, request, view):
+        authenticated, is_admin, _ = _user_flags(request)
+        return is_admin or not authenticated
+
+
 class IsStudentAndOwnerProfile(permissions.BasePermission):
     """
     Permission to allow only students to access their own profiles.
@@ -183,19 +236,15 @@ class IsStudentAndOwnerProfile(permissions.BasePermission):
     message = "You can only access your own profile."
 
     def has_permission(self, request, view):
-        if request.user and (request.user.is_staff or request.user.is_superuser):
-            return True
-
-        if view.action == "create":
-            if request.user and request.user.is_authenticated:
-                return False
-            return True
-        return request.user and request.user.is_authenticated
+        # Sign-up (create) is routed to IsAnonymousOrAdmin by the viewset
+        authenticated, _, _ = _user_flags(request)
+        return authenticated
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_staff or request.user.is_superuser:
+        _, is_admin, _ = _user_flags(request)
+        if is_admin:
             return True
-        return obj.user == request.user
+        return obj.user_id == request.user.id
 
 
 class IsTeacherAndOwnerProfile(permissions.BasePermission):
@@ -206,16 +255,18 @@ class IsTeacherAndOwnerProfile(permissions.BasePermission):
     message = "You can only access your own profile."
 
     def has_permission(self, request, view):
-        if request.user.is_staff or request.user.is_superuser:
+        authenticated, is_admin, user_type = _user_flags(request)
+        if is_admin:
             return True
         if view.action == "create":
             return False
-        return request.user.is_authenticated and request.user.user_type == "teacher"
+        return authenticated and user_type == "teacher"
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_staff or request.user.is_superuser:
+        _, is_admin, _ = _user_flags(request)
+        if is_admin:
             return True
-        return obj.user == request.user
+        return obj.user_id == request.user.id
 
 
 class IsAuthenticated(permissions.BasePermission):
@@ -229,22 +280,20 @@ class IsAuthenticated(permissions.BasePermission):
         return request.user and request.user.is_authenticated
 
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        return obj.user_id == request.user.id
 
 
 class IsStudentOrAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
+        authenticated, is_admin, _ = _user_flags(request)
         if view.action == "list":
-            return request.user.is_authenticated and (
-                request.user.is_staff or request.user.is_superuser
-            )
+            return authenticated and is_admin
 
-        if view.action == "create":
-            return request.user.is_authenticated
-        return request.user.is_authenticated
+        return authenticated
 
     def has_object_permission(self, request, view, obj):
-        if request.user.is_staff or request.user.is_superuser:
+        _, is_admin, _ = _user_flags(request)
+        if is_admin:
             return True
 
-        return obj.student.user == request.user
+        return obj.student.user_id == request.user.id
@@ -1,6 +1,11 @@
+import logging
+
 from rest_framework import serializers
 from .models import User, Teacher, Student
 from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -19,27 +24,67 @@ class UserSerializer(serializers.ModelSerializer):
             "password": {"write_only": True},
         }
 
+    def to_internal_value(self, data):
+        # Only admins may set user_type. For anyone else it behaves as
+        # read-only: dropped before field validation, once per write, instead
+        # of rebinding the nested field on every serializer instance.
+        request = self.context.get("request")
+        if (
+            isinstance(data, dict)
+            and "user_type" in data
+            and request
+            and request.user
+            and not getattr(request.user, "is_admin", False)
+        ):
+            data = {key: value for key, value in data.items() if key != "user_type"}
+        return super().to_internal_value(data)
+
+
+def _update_user(user, user_data):
+    """Apply nested ``user_info`` changes, writing only the submitted columns."""
+    if "password" not in user_data:
+        # Plain column values (already validated by UserSerializer): one
+        # queryset UPDATE, no model save() or signals, mirrored onto the user
+        changes = {**user_data, "updated_at": timezone.now()}
+        User.objects.filter(pk=user.pk).update(**changes)
+        for attr, value in changes.items():
+            setattr(user, attr, value)
+        return
+
+    for attr, value in user_data.items():
+        if attr == "password":
+            user.set_password(value)
+        else:
+            setattr(user, attr, value)
+    user.save(update_fields=[*user_data, "updated_at"])
+
+
+class UserInfoSerializer(serializers.ModelSerializer):
+    """Read-only user summary nested in the profile list serializers."""
+
+    class Meta:
+        model = User
+        fields = ["username", "first_name", "last_name", "user_type"]
+
+
+class UserInfoDetailSerializer(serializers.ModelSerializer):
+    """Read-only user summary nested in the profile detail serializers."""
+
+    class Meta:
+        model = User
+        fields = ["username", "email", "first_name", "last_name", "user_type"]
+
 
 class TeacherlistSerializer(serializers.ModelSerializer):
-    user_info = serializers.SerializerMethodField()
+    user_info = UserInfoSerializer(source="user", read_only=True)
 
     class Meta:
         model = Teacher
         fields = ["id", "user_info"]
 
-    def get_user_info(self, obj):
-        if obj.user:
-            return {
-                "username": obj.user.username,
-                "first_name": obj.user.first_name,
-                "last_name": obj.user.last_name,
-                "user_type": obj.user.user_type,
-            }
-        return None
-
 
 class TeacherDetailSerializer(serializers.ModelSerializer):
-    user_info = serializers.SerializerMethodField()
+    user_info = UserInfoDetailSerializer(source="user", read_only=True)
 
     class Meta:
         model = Teacher
@@ -52,31 +97,10 @@ class TeacherDetailSerializer(serializers.ModelSerializer):
             "created_at",
         ]
 
-    def get_user_info(self, obj):
-        if obj.user:
-            return {
-                "username": obj.user.username,
-                "email": obj.user.email,
-                "first_name": obj.user.first_name,
-                "last_name": obj.user.last_name,
-                "user_type": obj.user.user_type,
-            }
-        return None
-
 
 class teacherCreateUpdateSerializer(serializers.ModelSerializer):
     user_info = UserSerializer(source="user")
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        request = self.context.get("request")
-        if request and request.user:
-            if not (request.user.is_staff or request.user.is_superuser):
-                user_fields = self.fields["user_info"].fields
-                if "user_type" in user_fields:
-                    user_fields["user_type"].read_only = True
-
     class Meta:
         model = Teacher
         fields = [
@@ -89,22 +113,16 @@ class teacherCreateUpdateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         user_data = validated_data.pop("user")
-        with transaction.atomic():
+        with transaction.atomic(savepoint=False):
             user = User.objects.create_user(**user_data)
             teacher = Teacher.objects.create(user=user, **validated_data)
         return teacher
 
     def update(self, instance, validated_data):
         user_data = validated_data.pop("user", None)
-        with transaction.atomic():
+        with transaction.atomic(savepoint=False):
             if user_data:
-                user_instance = instance.user
-                for attr, value in user_data.items():
-                    if attr == "password":
-                        user_instance.set_password(value)
-                    else:
-                        setattr(user_instance, attr, value)
-                user_instance.save()
+                _update_user(instance.user, user_data)
             # update teacher fields
             return super().update(instance, validated_data)
 
@@ -116,25 +134,15 @@ class teacherCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 class StudentlistSerializer(serializers.ModelSerializer):
-    user_info = serializers.SerializerMethodField()
+    user_info = UserInfoSerializer(source="user", read_only=True)
 
     class Meta:
         model = Student
         fields = ["id", "user_info", "grade_level"]
 
-    def get_user_info(self, obj):
-        if obj.user:
-            return {
-                "username": obj.user.username,
-                "first_name": obj.user.first_name,
-                "last_name": obj.user.last_name,
-                "user_type": obj.user.user_type,
-            }
-        return None
-
 
 class StudentDetailSerializer(serializers.ModelSerializer):
-    user_info = serializers.SerializerMethodField()
+    user_info = UserInfoDetailSerializer(source="user", read_only=True)
 
     class Meta:
         model = Student
@@ -150,31 +158,10 @@ class StudentDetailSerializer(serializers.ModelSerializer):
             "enrolled_courses_count",
         ]
 
-    def get_user_info(self, obj):
-        if obj.user:
-            return {
-                "username": obj.user.username,
-                "email": obj.user.email,
-                "first_name": obj.user.first_name,
-                "last_name": obj.user.last_name,
-                "user_type": obj.user.user_type,
-            }
-        return None
-
 
 class StudentCreateUpdateSerializer(serializers.ModelSerializer):
     user_info = UserSerializer(source="user")
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-
-        request = self.context.get("request")
-        if request and request.user:
-            if not (request.user.is_staff or request.user.is_superuser):
-                user_fields = self.fields["user_info"].fields
-                if "user_type" in user_fields:
-                    user_fields["user_type"].read_only = True
-
     class Meta:
         model = Student
         fields = ["id", "user_info", "academic_year", "phone", "parent_phone"]
@@ -182,30 +169,21 @@ class StudentCreateUpdateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         user_data = validated_data.pop("user")
-        with transaction.atomic():
+        with transaction.atomic(savepoint=False):
             user = User.objects.create_user(**user_data)
             student = Student.objects.create(user=user, **validated_data)
         return student
 
     def validate(self, attrs):
         # Debugging: Log the incoming data for validation
-        import logging
-
-        logger = logging.getLogger(__name__)
-        logger.debug(f"Validating data: {attrs}")
+        logger.debug("Validating data: %s", attrs)
         return super().validate(attrs)
 
     def update(self, instance, validated_data):
         user_data = validated_data.pop("user", None)
-        with transaction.atomic():
+        with transaction.atomic(savepoint=False):
             if user_data:
-                user_instance = instance.user
-                for attr, value in user_data.items():
-                    if attr == "password":
-                        user_instance.set_password(value)
-                    else:
-                        setattr(user_instance, attr, value)
-                user_instance.save()
+                _update_user(instance.user, user_data)
             # update student fields
             return super().update(instance, validated_data)
 
@@ -1,7 +1,11 @@
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
-from users.models import Teacher, Student
+from django.core.files.uploadedfile import SimpleUploadedFile
+from users.backends import ProfileModelBackend
+from users.models import MAX_ACADEMIC_YEAR, Teacher, Student
+from users.validators import validate_cv, validate_pdf
 
 User = get_user_model()
 
@@ -23,6 +27,20 @@ class UserModelTest(TestCase):
         user.full_clean()
         self.assertTrue(user.is_staff)
 
+    def test_soft_delete_and_restore(self):
+        user = User.objects.create_user(username="gone", password="password123")
+        with self.assertNumQueries(1):
+            user.soft_delete()
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
+        self.assertIsNotNone(user.deleted_at)
+
+        with self.assertNumQueries(1):
+            user.restore()
+        user.refresh_from_db()
+        self.assertTrue(user.is_active)
+        self.assertIsNone(user.deleted_at)
+
     def test_invalid_user_type(self):
         with self.assertRaises(ValidationError):
             user = User(username="invaliduser", user_type="invalid")
@@ -31,11 +49,11 @@ class UserModelTest(TestCase):
 
 class TeacherModelTest(TestCase):
 
-    def setUp(self):
-        self.teacher_user = User.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher_user = User.objects.create(
             username="teacheruser", password="password123", user_type="teacher"
         )
-        self.teacher_user.save()
 
     def test_teacher_creation(self):
         self.assertEqual(self.teacher_user.user_type, "teacher")
@@ -45,6 +63,53 @@ class TeacherModelTest(TestCase):
         self.assertEqual(teacher.user, self.teacher_user)
         self.assertTrue(teacher.is_verified)
 
+    def test_teacher_save_touches_user_with_single_update(self):
+        teacher = Teacher.objects.create(user=self.teacher_user)
+        before = User.objects.get(pk=self.teacher_user.pk).updated_at
+        teacher = Teacher.objects.get(pk=teacher.pk)
+        with self.assertNumQueries(2):
+            teacher.save(skip_validation=True, update_fields=["hourly_rate"])
+        self.assertGreater(User.objects.get(pk=self.teacher_user.pk).updated_at, before)
+
+    def test_verify_teacher_skips_full_clean(self):
+        teacher = Teacher.objects.create(user=self.teacher_user)
+        admin = User.objects.create(username="admin", is_staff=True)
+        teacher = Teacher.objects.get(pk=teacher.pk)
+        # Profile UPDATE + user timestamp UPDATE; no validation queries
+        with self.assertNumQueries(2):
+            self.assertTrue(teacher.verify_teacher(admin))
+
+    def test_validate_pdf_skips_already_stored_files(self):
+        with self.assertRaises(ValidationError) as ctx:
+            validate_pdf(SimpleUploadedFile("cv.pdf", b"not a pdf"))
+        self.assertEqual(ctx.exception.code, "invalid_pdf_format")
+        # A stored FieldFile is not reopened (this one doesn't even exist)
+        teacher = Teacher(user=self.teacher_user, cv="users/cv/missing-cv.pdf")
+        validate_pdf(teacher.cv)
+
+    def test_validate_cv_stops_at_extension(self):
+        with self.assertRaises(ValidationError) as ctx:
+            validate_cv(SimpleUploadedFile("cv.txt", b"not a pdf"))
+        self.assertEqual(ctx.exception.code, "invalid_extension")
+        validate_cv(SimpleUploadedFile("cv.pdf", b"%PDF-1.4"))
+
+    def test_backend_loads_profile_with_session_user(self):
+        teacher = Teacher.objects.create(user=self.teacher_user)
+        with self.assertNumQueries(1):
+            user = ProfileModelBackend().get_user(self.teacher_user.pk)
+            self.assertEqual(user.teacher_profile, teacher)
+            self.assertFalse(hasattr(user, "student_profile"))
+
+    def test_verify_teacher_ignores_stale_instance(self):
+        teacher = Teacher.objects.create(user=self.teacher_user)
+        stale = Teacher.objects.get(pk=teacher.pk)
+        admin = User.objects.create(username="admin", is_staff=True)
+        self.assertTrue(teacher.verify_teacher(admin))
+        # The guarded UPDATE matches no row; the user isn't touched
+        with self.assertNumQueries(1):
+            self.assertFalse(stale.verify_teacher(admin))
+        self.assertFalse(stale.is_verified)
+
     def test_teacher_creation_invalid_user_type(self):
         student_user = get_user_model().objects.create(
             username="studentuser", password="password123", user_type="student"
@@ -58,8 +123,9 @@ class TeacherModelTest(TestCase):
 
 class StudentModelTest(TestCase):
 
-    def setUp(self):
-        self.student_user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.student_user = User.objects.create_user(
             username="studentuser", password="password123", user_type="student"
         )
 
@@ -89,3 +155,66 @@ class StudentModelTest(TestCase):
                 parent_phone="01098765432",
             )
             student.full_clean()
+
+    def test_bulk_create_rejects_matching_parent_phone(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Student.objects.bulk_create(
+                [
+                    Student(
+                        user=self.student_user,
+                        academic_year=2,
+                        phone="01012345678",
+                        parent_phone="01012345678",
+                    )
+                ]
+            )
+
+    def test_bulk_promote_skips_final_year(self):
+        senior_user = User.objects.create_user(
+            username="senioruser", password="password123", user_type="student"
+        )
+        student = Student.objects.create(
+            user=self.student_user,
+            academic_year=2,
+            phone="01012345678",
+            parent_phone="01098765432",
+        )
+        senior = Student.objects.create(
+            user=senior_user,
+            academic_year=MAX_ACADEMIC_YEAR,
+            phone="01012345679",
+            parent_phone="01098765433",
+        )
+
+        # Two UPDATEs, wrapped in a savepoint inside the test transaction
+        with self.assertNumQueries(4):
+            promoted = Student.bulk_promote()
+
+        self.assertEqual(promoted, 1)
+        student.refresh_from_db()
+        senior.refresh_from_db()
+        self.assertEqual(student.academic_year, 3)
+        self.assertEqual(senior.academic_year, MAX_ACADEMIC_YEAR)
+
+    def test_seniors_matches_is_senior(self):
+        student = Student.objects.create(
+            user=self.student_user,
+            academic_year=10,
+            phone="01012345678",
+            parent_phone="01098765432",
+        )
+
+        self.assertTrue(student.is_senior)
+        self.assertQuerySetEqual(Student.objects.seniors(), [student])
+        self.assertFalse(Student.objects.filter(academic_year__lt=10).seniors())
+
+    def test_save_stores_normalized_phones(self):
+        student = Student.objects.create(
+            user=self.student_user,
+            academic_year=2,
+            phone="010-1234 5678",
+            parent_phone="(010) 98765432",
+        )
+        student.refresh_from_db()
+        self.assertEqual(student.phone, "01012345678")
+        self.assertEqual(student.parent_phone, "01098765432")
@@ -1,5 +1,6 @@
 from django.test import TestCase
 from rest_framework.test import APIRequestFactory, force_authenticate
+from users.backends import ProfileModelBackend
 from users.models import User, Teacher, Student
 from courses.models.course_models import Course, Education
 from courses.models.interactionCourse_models import Enrollment
@@ -7,27 +8,27 @@ from users.permissions import (
     IsTeacherOwnerOrReadOnly,
     IsEnrollmentOwner,
     IsStudentEnrolledOrReadOnly,
+    IsTeacher,
 )
-import io
-from PIL import Image
 from django.core.files.uploadedfile import SimpleUploadedFile
+from users.tests.utils import encode_jpeg
 
 
 class PermissionTests(TestCase):
 
+    @classmethod
+    def setUpTestData(cls):
+        # Encode once per class; wrapping the bytes per test is cheap
+        cls.img_300 = encode_jpeg(300, 300)
+
     def setUp(self):
         self.factory = APIRequestFactory()
 
         education = Education.objects.create(country="Egypt", country_code="EGY")
-        file_io = io.BytesIO()
-        image = Image.new("RGB", (300, 300), color="white")
-        image.save(file_io, "JPEG")
-        file_io.seek(0)
-
         # 2. تحويلها لملف يفهمه ديجانجو (SimpleUploadedFile)
         temp_img = SimpleUploadedFile(
             name="test_course_image.jpg",
-            content=file_io.read(),
+            content=self.img_300,
             content_type="image/jpeg",
         )
         # Create users
@@ -136,13 +137,52 @@ class PermissionTests(TestCase):
         permission = IsStudentEnrolledOrReadOnly()
 
         # Test with an enrolled student (Success)
-        request = self.factory.get("/")
+        request = self.factory.put("/")
         force_authenticate(request, user=self.student_user)
         request.user = self.student_user
         self.assertTrue(permission.has_object_permission(request, None, self.course))
+        # Later checks on the same request reuse the enrolled course ids
+        with self.assertNumQueries(0):
+            permission.has_object_permission(request, None, self.course)
+
+        # Test read-only access for a non-enrolled student (Success, no query)
+        request = self.factory.get("/")
+        request.user = self.other_student_user
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                permission.has_object_permission(request, None, self.course)
+            )
 
         # Test with a non-enrolled student (Fail)
         request = self.factory.put("/")
         force_authenticate(request, user=self.other_student_user)
         request.user = self.other_student_user
         self.assertFalse(permission.has_object_permission(request, None, self.course))
+
+    def test_is_student_enrolled_uses_session_profile(self):
+        permission = IsStudentEnrolledOrReadOnly()
+        backend = ProfileModelBackend()
+
+        # No query at all for a user without a student profile
+        for user, expected, queries in (
+            (self.student_user, True, 1),
+            (self.other_student_user, False, 1),
+            (self.teacher_user, False, 0),
+        ):
+            request = self.factory.put("/")
+            request.user = backend.get_user(user.pk)
+            with self.assertNumQueries(queries):
+                self.assertEqual(
+                    permission.has_object_permission(request, None, self.course),
+                    expected,
+                )
+
+    def test_user_flags_follow_request_user(self):
+        permission = IsTeacher()
+        request = self.factory.post("/")
+        request.user = self.teacher_user
+        self.assertTrue(permission.has_permission(request, None))
+
+        # Flags cached for the previous user are not reused for a new one
+        request.user = self.student_user
+        self.assertFalse(permission.has_permission(request, None))
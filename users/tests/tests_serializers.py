@@ -4,6 +4,7 @@ from django.contrib.auth.hashers import check_password
 from django.urls import reverse
 from users.models import User, Teacher, Student
 from users.serializers import (
+    TeacherlistSerializer,
     teacherCreateUpdateSerializer,
     StudentCreateUpdateSerializer,
 )
@@ -11,18 +12,20 @@ from rest_framework.authtoken.models import Token
 
 
 class TeacherSerializerTests(APITestCase):
-    def setUp(self):
-        self.admin_user = User.objects.create_superuser(
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(
             username="admin", password="admin123", email="admin@example.com"
         )
-        self.teacher_user = User.objects.create_user(
+        cls.teacher_user = User.objects.create_user(
             username="teacher1", password="password123", user_type="teacher"
         )
-        self.teacher = Teacher.objects.create(user=self.teacher_user, is_verified=True)
+        cls.teacher = Teacher.objects.create(user=cls.teacher_user, is_verified=True)
 
     def test_create_teacher(self):
-        factory = APIRequestFactory()
-        request = factory.post("/")
+        request = self.factory.post("/")
         request.user = self.admin_user
         data = {
             "user_info": {
@@ -47,8 +50,7 @@ class TeacherSerializerTests(APITestCase):
         )
 
     def test_update_teacher(self):
-        factory = APIRequestFactory()
-        request = factory.patch("/")
+        request = self.factory.patch("/")
         request.user = self.teacher_user
 
         data = {
@@ -68,10 +70,27 @@ class TeacherSerializerTests(APITestCase):
         teacher = serializer.save()
         self.assertEqual(teacher.user.username, data["user_info"]["username"])
         self.assertEqual(teacher.experience_years, data["experience_years"])
+        stored = User.objects.get(pk=self.teacher_user.pk)
+        self.assertEqual(stored.email, data["user_info"]["email"])
+
+    def test_update_teacher_password_only(self):
+        request = self.factory.patch("/")
+        request.user = self.teacher_user
+        serializer = teacherCreateUpdateSerializer(
+            instance=self.teacher,
+            data={"user_info": {"password": "changed12345"}},
+            partial=True,
+            context={"request": request},
+        )
+
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        user = User.objects.get(pk=self.teacher_user.pk)
+        self.assertTrue(check_password("changed12345", user.password))
+        self.assertEqual(user.username, "teacher1")
 
     def test_user_type_read_only(self):
-        factory = APIRequestFactory()
-        request = factory.patch("/")
+        request = self.factory.patch("/")
         request.user = self.teacher_user
         data = {"user_info": {"user_type": "admin"}}
         serializer = teacherCreateUpdateSerializer(
@@ -82,9 +101,7 @@ class TeacherSerializerTests(APITestCase):
         self.assertEqual(teacher.user.user_type, "teacher")
 
     def test_invalid_data(self):
-        factory = APIRequestFactory()
-
-        request = factory.patch("/")
+        request = self.factory.patch("/")
         request.user = self.teacher_user
 
         data = {
@@ -104,22 +121,30 @@ class TeacherSerializerTests(APITestCase):
         self.assertIn("user_info", serializer.errors)
         self.assertIn("experience_years", serializer.errors)
 
+    def test_list_serializer_renders_pruned_rows_without_queries(self):
+        teachers = list(Teacher.objects.for_list())
+        with self.assertNumQueries(0):
+            data = TeacherlistSerializer(teachers, many=True).data
+        self.assertEqual(data[0]["user_info"]["username"], "teacher1")
+
 
 class StudentSerializerTests(APITestCase):
-    def setUp(self):
-        self.student_user = User.objects.create_user(
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student_user = User.objects.create_user(
             username="student1", password="password123", user_type="student"
         )
-        self.student = Student.objects.create(
-            user=self.student_user,
+        cls.student = Student.objects.create(
+            user=cls.student_user,
             academic_year=3,
             phone="01234557890",
             parent_phone="01234547891",
         )
 
     def test_create_student(self):
-        factory = APIRequestFactory()
-        request = factory.post("/")
+        request = self.factory.post("/")
         request.user = self.student_user
         data = {
             "user_info": {
@@ -144,8 +169,7 @@ class StudentSerializerTests(APITestCase):
         )
 
     def test_update_student(self):
-        factory = APIRequestFactory()
-        request = factory.patch("/")
+        request = self.factory.patch("/")
         request.user = self.student_user
         data = {
             "user_info": {
@@ -165,8 +189,7 @@ class StudentSerializerTests(APITestCase):
         self.assertEqual(student.academic_year, data["academic_year"])
 
     def test_user_type_read_only(self):
-        factory = APIRequestFactory()
-        request = factory.patch("/")
+        request = self.factory.patch("/")
         request.user = self.student_user
         data = {"user_info": {"user_type": "teacher"}}
         serializer = StudentCreateUpdateSerializer(
@@ -179,8 +202,7 @@ class StudentSerializerTests(APITestCase):
         )  # user_type should not change
 
     def test_invalid_data(self):
-        factory = APIRequestFactory()
-        request = factory.post("/")
+        request = self.factory.post("/")
         request.user = self.student_user
         data = {
             "user_info": {
@@ -1,19 +1,25 @@
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase
 from rest_framework import status
+from django.contrib.auth import BACKEND_SESSION_KEY
 from django.urls import reverse
+from django.contrib.auth.hashers import make_password
+from users.middleware import LEGACY_SESSION_BACKEND
 from users.models import User, Teacher, Student
 
+# Hashed once for users bulk-created inside tests
+HASHED_PASSWORD = make_password("password123")
+
 
 class TeacherViewSetTests(APITestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.admin_user = User.objects.create_superuser(
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser(
             username="admin", password="admin123", email="admin@example.com"
         )
-        self.teacher_user = User.objects.create_user(
+        cls.teacher_user = User.objects.create_user(
             username="teacher1", password="password123", user_type="teacher"
         )
-        self.teacher = Teacher.objects.create(user=self.teacher_user, is_verified=True)
+        cls.teacher = Teacher.objects.create(user=cls.teacher_user, is_verified=True)
 
     def test_admin_can_create_teacher(self):
         self.client.force_authenticate(user=self.admin_user)
@@ -58,6 +64,16 @@ class TeacherViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.teacher.id)
 
+    def test_legacy_backend_session_stays_logged_in(self):
+        self.client.force_login(self.teacher_user, backend=LEGACY_SESSION_BACKEND)
+        url = reverse("teacher-detail", kwargs={"pk": self.teacher.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.session[BACKEND_SESSION_KEY],
+            "users.backends.ProfileModelBackend",
+        )
+
     def test_teacher_cannot_access_other_profiles(self):
         other_teacher_user = User.objects.create_user(
             username="teacher2", password="password123", user_type="teacher"
@@ -70,15 +86,35 @@ class TeacherViewSetTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_admin_list_query_count_independent_of_teachers(self):
+        users = User.objects.bulk_create(
+            User(username=f"extra{i}", password=HASHED_PASSWORD, user_type="teacher")
+            for i in range(3)
+        )
+        Teacher.objects.bulk_create(Teacher(user=user) for user in users)
+        self.client.force_authenticate(user=self.admin_user)
+        # Users are joined into the single list query
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("teacher-list"))
+        self.assertEqual(len(response.data), 4)
+
+    def test_detail_renders_user_without_extra_queries(self):
+        self.client.force_authenticate(user=self.teacher_user)
+        url = reverse("teacher-detail", kwargs={"pk": self.teacher.id})
+        # Teacher + user JOIN, plus the additional_subjects primary keys
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data["user_info"]["username"], "teacher1")
+
 
 class StudentViewSetTests(APITestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.student_user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.student_user = User.objects.create_user(
             username="student1", password="password123", user_type="student"
         )
-        self.student = Student.objects.create(
-            user=self.student_user,
+        cls.student = Student.objects.create(
+            user=cls.student_user,
             academic_year="10",
             phone="01234567890",
             parent_phone="01234567891",
@@ -90,6 +126,7 @@ class StudentViewSetTests(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["id"], self.student.id)
+        self.assertEqual(response.data["enrolled_courses_count"], 0)
 
     def test_student_cannot_access_other_profiles(self):
         other_student_user = User.objects.create_user(
@@ -123,6 +160,11 @@ class StudentViewSetTests(APITestCase):
         response = self.client.post(url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_signed_in_student_cannot_create_student(self):
+        self.client.force_authenticate(user=self.student_user)
+        response = self.client.post(reverse("student-list"), {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_anonymous_user_cannot_create_teacher(self):
         data = {
             "user_info": {
@@ -0,0 +1,10 @@
+import io
+
+from PIL import Image
+
+
+def encode_jpeg(width, height):
+    """Return the bytes of a plain white JPEG of the given size."""
+    file_io = io.BytesIO()
+    Image.new("RGB", (width, height), color="white").save(file_io, "JPEG")
+    return file_io.getvalue()
@@ -1,4 +1,3 @@
-from django.db import router
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
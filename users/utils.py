@@ -0,0 +1,10 @@
+from django.db.models import Count, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, group_by):
+    """Row count of ``queryset`` as a scalar subquery (0 when empty)."""
+    counted = (
+        queryset.order_by().values(group_by).annotate(total=Count("pk")).values("total")
+    )
+    return Coalesce(Subquery(counted), 0)
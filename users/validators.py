@@ -1,8 +1,8 @@
-import os
 import re
+import secrets
 from django.conf import settings
-from django.utils.text import slugify
 from django.core.exceptions import ValidationError
+from django.core.validators import FileExtensionValidator
 from django.utils.translation import gettext_lazy as _
 
 # =====================
@@ -12,10 +12,20 @@ from django.utils.translation import gettext_lazy as _
 MIN_EXPERIENCE_YEARS = 1
 MAX_EXPERIENCE_YEARS = 50
 MAX_CV_FILE_SIZE_MB = getattr(settings, "MAX_CV_FILE_SIZE_MB", 5)
+BYTES_PER_MB = 1024 * 1024
+MAX_CV_FILE_SIZE_BYTES = MAX_CV_FILE_SIZE_MB * BYTES_PER_MB
 ALLOWED_CV_EXTENSIONS = getattr(settings, "ALLOWED_CV_EXTENSIONS", ["pdf"])
 MIN_ACADEMIC_YEAR = 1
 MAX_ACADEMIC_YEAR = 12
 
+# Extension check run first by validate_cv()
+_CV_EXTENSION = FileExtensionValidator(allowed_extensions=ALLOWED_CV_EXTENSIONS)
+
+# Phone formatting characters stripped before matching
+_PHONE_STRIP = re.compile(r"[\s\-\(\)]").sub
+# Egyptian mobile pattern: 010-015 + 7 or 8 digits, as one character class
+_PHONE_MATCH = re.compile(r"^01[0-5]\d{7,8}$").match
+
 # =====================
 # CUSTOM VALIDATORS
 # =====================
@@ -34,10 +44,9 @@ def validate_file_size(value):
     if not value:
         return
 
-    max_size_bytes = MAX_CV_FILE_SIZE_MB * 1024 * 1024
     filesize = value.size
 
-    if filesize > max_size_bytes:
+    if filesize > MAX_CV_FILE_SIZE_BYTES:
         raise ValidationError(
             _(
                 "File size cannot exceed %(max_size)sMB. "
@@ -45,7 +54,7 @@ def validate_file_size(value):
             ),
             params={
                 "max_size": MAX_CV_FILE_SIZE_MB,
-                "current_size": filesize / (1024 * 1024),
+                "current_size": filesize / BYTES_PER_MB,
             },
             code="file_too_large",
         )
@@ -67,44 +76,65 @@ def validate_pdf(file):
     Note:
         For production, integrate with virus scanning (ClamAV) and
         consider using PyPDF2 for deeper validation.
+
+        Files already in storage were checked when uploaded, so they are
+        not reopened on later profile saves.
     """
-    if not file:
+    if not file or getattr(file, "_committed", False):
         return
 
     try:
-        # Ensure file pointer is at start
+        # Read the 5-byte signature from the start, then rewind for the
+        # storage backend
         file.seek(0)
-
-        # Read first 5 bytes for PDF signature
         header = file.read(5)
-
-        # Reset file pointer for subsequent operations
         file.seek(0)
-
-        # Validate PDF signature
-        if not header or not header.startswith(b"%PDF-"):
-            raise ValidationError(
-                _(
-                    "Invalid PDF file. The file may be corrupted or in the wrong format."
-                ),
-                code="invalid_pdf_format",
-            )
-
     except AttributeError:
         # File object doesn't support seek (shouldn't happen with UploadedFile)
         raise ValidationError(
             _("Unable to validate file format. Invalid file object."),
             code="invalid_file_object",
         )
-    except Exception as e:
-        # Log this in production
+
+    # Validate PDF signature
+    if not header or not header.startswith(b"%PDF-"):
         raise ValidationError(
-            _("Error validating PDF: %(error)s"),
-            params={"error": str(e)},
-            code="pdf_validation_error",
+            _("Invalid PDF file. The file may be corrupted or in the wrong format."),
+            code="invalid_pdf_format",
         )
 
 
+def validate_cv(file):
+    """
+    Validate a CV upload: extension, then size, then PDF header.
+
+    Stops at the first failure, so a file with the wrong extension or size
+    is never opened. Files already in storage were checked when uploaded
+    and are skipped; reading their ``size`` would be a storage call.
+
+    Args:
+        file: Django UploadedFile object
+
+    Raises:
+        ValidationError: If any of the checks fail
+    """
+    if not file or getattr(file, "_committed", False):
+        return
+
+    _CV_EXTENSION(file)
+    validate_file_size(file)
+    validate_pdf(file)
+
+
+def normalize_phone(value):
+    """
+    Strip formatting characters (spaces, dashes, parentheses) from a phone.
+
+    Example: "010-1234 5678" -> "01012345678"
+    """
+    return _PHONE_STRIP("", str(value))
+
+
 def validate_phone(value):
     """
     Validate Egyptian phone number format.
@@ -115,12 +145,9 @@ def validate_phone(value):
         return
 
     # Remove common formatting characters
-    cleaned = re.sub(r"[\s\-\(\)]", "", str(value))
+    cleaned = normalize_phone(value)
 
-    # Egyptian mobile pattern: 010/011/012/015 + 8 digits
-    pattern = r"^(010|011|012|013|014|015)(\d{8}|\d{7})$"
-
-    if not re.match(pattern, cleaned):
+    if not _PHONE_MATCH(cleaned):
         raise ValidationError(
             "Invalid Egyptian phone number. Must be 11 digits starting with "
             "010, 011, 012, or 015. Example: 01012345678"
@@ -165,8 +192,12 @@ def cv_upload_path(instance, filename):
     """
     Generate secure upload path for teacher CV files.
 
-    Path structure: users/cv/{user_id}/{username}-cv.pdf
-    Example: users/cv/123/john-doe-cv.pdf
+    Path structure: users/cv/{user_id}/cv-{hex8}.{ext}
+    Example: users/cv/123/cv-a1b2c3d4.pdf
+
+    Only the user's id is used, so the User row isn't loaded and the path
+    doesn't go stale when the username changes; the random suffix keeps
+    re-uploads from colliding.
 
     Args:
         instance: Teacher model instance
@@ -175,10 +206,7 @@ def cv_upload_path(instance, filename):
     Returns:
         str: Secure file path
     """
-    ext = filename.split(".")[-1].lower()
-
-    # Create safe filename using username (limit to 50 chars)
-    safe_name = slugify(instance.user.username)[:50]
-    new_filename = f"{safe_name}-cv.{ext}"
+    ext = filename.rsplit(".", 1)[-1].lower()
 
-    return os.path.join("users", "cv", str(instance.user.id), new_filename)
+    # Storage paths are always posix-style, whatever the host OS
+    return f"users/cv/{instance.user_id}/cv-{secrets.token_hex(4)}.{ext}"
@@ -1,5 +1,9 @@
+import logging
+
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from django.db.models import Exists, OuterRef
+from courses.models.interactionCourse_models import Enrollment
 from .models import Teacher, Student
 from .serializers import (
     TeacherlistSerializer,
@@ -10,35 +14,42 @@ from .serializers import (
     teacherCreateUpdateSerializer,
 )
 from .permissions import (
+    IsAnonymousOrAdmin,
     IsStudentAndOwnerProfile,
     IsTeacherAndOwnerProfile,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class TeacherViewSet(viewsets.ModelViewSet):
     permission_classes = [
         IsTeacherAndOwnerProfile
     ]  # Set appropriate permissions for teachers
 
+    serializer_classes = {
+        "list": TeacherlistSerializer,
+        "retrieve": TeacherDetailSerializer,
+        "create": teacherCreateUpdateSerializer,
+        "update": teacherCreateUpdateSerializer,
+        "partial_update": teacherCreateUpdateSerializer,
+    }
+
     def get_serializer_class(self):
-        if self.action == "list":
-            return TeacherlistSerializer
-        elif self.action == "retrieve":
-            return TeacherDetailSerializer
-        elif self.action in ["create", "update", "partial_update"]:
-            return teacherCreateUpdateSerializer
-        else:
-            return TeacherDetailSerializer
+        return self.serializer_classes.get(self.action, TeacherDetailSerializer)
 
     def get_queryset(self):
         user = self.request.user
         if not user.is_authenticated:
-            return Teacher.objectsqueryset.none()
-        queryset = Teacher.objects.select_related("user").all()
-        if user.is_staff or user.is_superuser:
+            return Teacher.objects.none()
+        if self.action == "list":
+            queryset = Teacher.objects.for_list()
+        else:
+            queryset = Teacher.objects.with_user()
+        if user.is_admin:
             return queryset
         elif user.user_type == "teacher":
-            return queryset.filter(user=user)
+            return queryset.filter(user_id=user.id)
         return queryset.none()
 
 
@@ -47,43 +58,54 @@ class StudentViewSet(viewsets.ModelViewSet):
         IsStudentAndOwnerProfile
     ]  # Set appropriate permissions for students
 
+    def get_permissions(self):
+        if self.action == "create":
+            return [IsAnonymousOrAdmin()]
+        return super().get_permissions()
+
+    serializer_classes = {
+        "list": StudentlistSerializer,
+        "retrieve": StudentDetailSerializer,
+        "create": StudentCreateUpdateSerializer,
+        "update": StudentCreateUpdateSerializer,
+        "partial_update": StudentCreateUpdateSerializer,
+    }
+
     def get_serializer_class(self):
-        if self.action == "list":
-            return StudentlistSerializer
-        elif self.action == "retrieve":
-            return StudentDetailSerializer
-        elif self.action in ["create", "update", "partial_update"]:
-            return StudentCreateUpdateSerializer
-        else:
-            return StudentDetailSerializer
+        return self.serializer_classes.get(self.action, StudentDetailSerializer)
 
     def get_queryset(self):
         user = self.request.user
         if not user.is_authenticated:
             return Student.objects.none()
-        queryset = Student.objects.select_related("user").all()
-        if user.is_staff or user.is_superuser:
+        if self.action == "list":
+            queryset = Student.objects.for_list()
+        else:
+            queryset = Student.objects.with_user()
+        if self.action == "retrieve":
+            # StudentDetailSerializer renders enrolled_courses_count
+            queryset = Student.with_counts(queryset)
+        if user.is_admin:
             return queryset
         elif user.user_type == "teacher":
-            return queryset.filter(enrollments__course__teacher__user=user).distinct()
+            # Semi-join: no row fan-out per enrollment, so no DISTINCT
+            return queryset.filter(
+                Exists(
+                    Enrollment.objects.filter(
+                        student=OuterRef("pk"), course__teacher__user_id=user.id
+                    )
+                )
+            )
         elif user.user_type == "student":
-            return queryset.filter(user=user)
+            return queryset.filter(user_id=user.id)
         return queryset.none()
 
     def create(self, request, *args, **kwargs):
         # Debugging: Log the incoming request data
-        import logging
-
-        logger = logging.getLogger(__name__)
-        logger.debug(f"Incoming request data: {request.data}")
+        logger.debug("Incoming request data: %s", request.data)
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-
-        # Debugging: Log serializer errors if any
-        if serializer.errors:
-            logger.debug(f"Serializer errors: {serializer.errors}")
-
         self.perform_create(serializer)
         headers = self.get_success_headers(serializer.data)
         return Response(
@@ -28,6 +28,9 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# Register models with the Django admin; keep off for API-only deployments.
+ENABLE_DJANGO_ADMIN = DEBUG
+
 import tempfile
 
 MEDIA_ROOT = tempfile.mkdtemp()
@@ -49,6 +52,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "users.middleware.LegacySessionBackendMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -133,3 +137,7 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
 AUTH_USER_MODEL = "users.User"
+
+# Session users come with their teacher/student profile preloaded. Sessions
+# created under ModelBackend are moved over by LegacySessionBackendMiddleware.
+AUTHENTICATION_BACKENDS = ["users.backends.ProfileModelBackend"]
@@ -0,0 +1,11 @@
+"""
+Settings for running the test suite.
+
+Usage: python manage.py test --settings=website.test_settings
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Fixtures hash a password for every user they create; PBKDF2 is
+# deliberately slow, and test credentials need no protection.
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
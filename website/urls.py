@@ -21,10 +21,12 @@ from django.conf import settings
 from django.conf.urls.static import static
 
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path("", include("courses.urls")),
     path("", include("users.urls")),
 ]
 
+if getattr(settings, "ENABLE_DJANGO_ADMIN", True):
+    urlpatterns.insert(0, path("admin/", admin.site.urls))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)